@@ -1,6 +1,7 @@
 import yfinance as yf
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 from .base_agent import BaseAgent
 
 class MarketDataAgent(BaseAgent):
@@ -56,33 +57,29 @@ class MarketDataAgent(BaseAgent):
         Returns:
             DataFrame with additional technical indicators
         """
-        df = data.copy()
+        close = data['Close']
         
-        # Simple Moving Averages
-        df['SMA_5'] = df['Close'].rolling(window=5, min_periods=1).mean()
-        df['SMA_20'] = df['Close'].rolling(window=20, min_periods=1).mean()
-        df['SMA_50'] = df['Close'].rolling(window=50, min_periods=1).mean()
+        # Intermediates stay ndarrays; the columns are attached once at the end
+        sma_20 = close.rolling(window=20, min_periods=1).mean().to_numpy()
         
         # RSI (Relative Strength Index)
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14, min_periods=1).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14, min_periods=1).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14, min_periods=1).mean().to_numpy()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14, min_periods=1).mean().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + gain / loss))
         
-        # Bollinger Bands - Simplified implementation
-        # First, ensure we have a clean Series for the calculations
-        close_prices = df['Close']
+        # Bollinger Bands around the 20-period SMA
+        rolling_std = close.rolling(window=20, min_periods=1).std().to_numpy()
         
-        # Calculate rolling mean and standard deviation
-        rolling_mean = close_prices.rolling(window=20, min_periods=1).mean()
-        rolling_std = close_prices.rolling(window=20, min_periods=1).std()
-        
-        # Calculate Bollinger Bands
-        df['BB_upper'] = rolling_mean + (2 * rolling_std)
-        df['BB_lower'] = rolling_mean - (2 * rolling_std)
-        
-        return df
+        return data.assign(
+            SMA_5=close.rolling(window=5, min_periods=1).mean().to_numpy(),
+            SMA_20=sma_20,
+            SMA_50=close.rolling(window=50, min_periods=1).mean().to_numpy(),
+            RSI=rsi,
+            BB_upper=sma_20 + (2 * rolling_std),
+            BB_lower=sma_20 - (2 * rolling_std)
+        )
     
     def process(self, ticker: str) -> pd.DataFrame:
         """Fetch and process market data for a given ticker.
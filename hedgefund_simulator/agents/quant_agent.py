@@ -1,7 +1,66 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Tuple
+from typing import Callable, Dict, Any, Tuple
 from .base_agent import BaseAgent
+from ..utils._njit import njit
+
+# Compiled signal kernels keyed by (rsi_overbought, rsi_oversold)
+_SIGNAL_KERNELS: Dict[Tuple[float, float], Callable[..., np.ndarray]] = {}
+
+def make_signal_kernel(rsi_overbought: float, rsi_oversold: float) -> Callable[..., np.ndarray]:
+    """Return a compiled kernel computing QuantAgent's combined signal.
+    
+    The RSI thresholds are baked into the kernel as compile-time constants,
+    so each configuration gets its own specialised machine code. Kernels are
+    memoized per threshold pair, so repeated backtests with the same
+    configuration reuse the compiled artifact.
+    
+    Args:
+        rsi_overbought: RSI threshold for overbought
+        rsi_oversold: RSI threshold for oversold
+        
+    Returns:
+        Function mapping (sma_fast, sma_slow, rsi) arrays to an int8 signal array
+    """
+    key = (rsi_overbought, rsi_oversold)
+    cached = _SIGNAL_KERNELS.get(key)
+    if cached is not None:
+        return cached
+    
+    hi = rsi_overbought
+    lo = rsi_oversold
+    
+    # Not cache=True: closures over different constants would share one cache entry
+    @njit
+    def kernel(sma_fast, sma_slow, rsi):
+        n = sma_fast.shape[0]
+        out = np.zeros(n, dtype=np.int8)
+        prev_regime = 0
+        for i in range(n):
+            # Crossover: change in which side of the slow MA the fast MA is on
+            regime = 0
+            if sma_fast[i] > sma_slow[i]:
+                regime = 1
+            elif sma_fast[i] < sma_slow[i]:
+                regime = -1
+            total = regime - prev_regime if i > 0 else 0
+            prev_regime = regime
+            
+            # RSI crossing back out of the oversold / overbought zones
+            if i > 0:
+                if rsi[i] < hi and rsi[i - 1] >= hi:
+                    total -= 1
+                elif rsi[i] > lo and rsi[i - 1] <= lo:
+                    total += 1
+            
+            if total > 0:
+                out[i] = 1
+            elif total < 0:
+                out[i] = -1
+        return out
+    
+    _SIGNAL_KERNELS[key] = kernel
+    return kernel
 
 class QuantAgent(BaseAgent):
     """Agent responsible for generating trading signals based on quantitative strategies."""
@@ -31,17 +90,19 @@ class QuantAgent(BaseAgent):
         Returns:
             Series with signals (1 for buy, -1 for sell, 0 for hold)
         """
-        signals = pd.Series(0, index=data.index)
+        fast = data[f'SMA_{self.fast_ma}'].to_numpy()
+        slow = data[f'SMA_{self.slow_ma}'].to_numpy()
         
-        # Generate signals based on crossover
-        signals[data[f'SMA_{self.fast_ma}'] > data[f'SMA_{self.slow_ma}']] = 1
-        signals[data[f'SMA_{self.fast_ma}'] < data[f'SMA_{self.slow_ma}']] = -1
+        # Regime per bar: 1 while fast is above slow, -1 while below
+        regime = np.zeros(len(data), dtype=np.int8)
+        regime[fast > slow] = 1
+        regime[fast < slow] = -1
         
         # Only take the first signal in each direction
-        signals = signals.diff()
-        signals[signals == 0] = 0
+        signals = np.zeros_like(regime)
+        signals[1:] = np.diff(regime)
         
-        return signals
+        return pd.Series(signals, index=data.index, copy=False)
     
     def rsi_signals(self, data: pd.DataFrame) -> pd.Series:
         """Generate signals based on RSI indicator.
@@ -52,17 +113,18 @@ class QuantAgent(BaseAgent):
         Returns:
             Series with signals (1 for buy, -1 for sell, 0 for hold)
         """
-        signals = pd.Series(0, index=data.index)
+        rsi = data['RSI'].to_numpy(dtype=np.float64)
+        prev = np.concatenate(([np.nan], rsi[:-1]))
+        
+        signals = np.zeros(len(rsi), dtype=np.int8)
         
         # Buy when RSI crosses above oversold
-        signals[(data['RSI'] > self.rsi_oversold) & 
-               (data['RSI'].shift(1) <= self.rsi_oversold)] = 1
+        signals[(rsi > self.rsi_oversold) & (prev <= self.rsi_oversold)] = 1
         
         # Sell when RSI crosses below overbought
-        signals[(data['RSI'] < self.rsi_overbought) & 
-               (data['RSI'].shift(1) >= self.rsi_overbought)] = -1
+        signals[(rsi < self.rsi_overbought) & (prev >= self.rsi_overbought)] = -1
         
-        return signals
+        return pd.Series(signals, index=data.index, copy=False)
     
     def combine_signals(self, *signal_series: pd.Series) -> pd.Series:
         """Combine multiple signal series into a single signal series.
@@ -76,18 +138,31 @@ class QuantAgent(BaseAgent):
         if not signal_series:
             return pd.Series(0, index=pd.DatetimeIndex([]))
         
-        # Start with the first series
-        combined = signal_series[0].copy()
+        # Start with the first series; summing in float64 avoids int8 overflow
+        combined = signal_series[0].astype(np.float64)
         
         # Combine with other series
         for series in signal_series[1:]:
             combined = combined.add(series, fill_value=0)
         
         # Normalize to -1, 0, 1
-        combined[combined > 0] = 1
-        combined[combined < 0] = -1
+        return pd.Series(np.sign(combined.to_numpy()).astype(np.int8), index=combined.index, copy=False)
+    
+    def combined_signal(self, data: pd.DataFrame) -> np.ndarray:
+        """Compute the combined signal of process() in a single compiled pass.
         
-        return combined.astype(int)
+        Args:
+            data: DataFrame containing market data with SMA and RSI columns
+            
+        Returns:
+            int8 array with signals (1 for buy, -1 for sell, 0 for hold)
+        """
+        kernel = make_signal_kernel(self.rsi_overbought, self.rsi_oversold)
+        return kernel(
+            data[f'SMA_{self.fast_ma}'].to_numpy(dtype=np.float64),
+            data[f'SMA_{self.slow_ma}'].to_numpy(dtype=np.float64),
+            data['RSI'].to_numpy(dtype=np.float64)
+        )
     
     def process(self, data: pd.DataFrame) -> Dict[str, pd.Series]:
         """Generate trading signals based on the input data.
@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, Union
 from .base_agent import BaseAgent
 
 class RiskManagerAgent(BaseAgent):
@@ -115,6 +116,41 @@ class RiskManagerAgent(BaseAgent):
         logger.info(f"Position size: {quantity} shares (${position_value:.2f}) at ${price_val:.2f} each")
         return quantity, position_value
     
+    def calculate_position_size_batch(
+        self,
+        prices: Union[np.ndarray, pd.Series],
+        portfolio_values: Union[float, np.ndarray, pd.Series],
+        atr: Optional[Union[np.ndarray, pd.Series]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized calculate_position_size over arrays of prices.
+        
+        Applies the same sizing rules as calculate_position_size element-wise,
+        so it can size many bars or tickers in one call without per-element
+        Python arithmetic. Invalid (non-positive or NaN) prices size to 0.
+        
+        Args:
+            prices: Current prices of the asset(s)
+            portfolio_values: Total portfolio value(s), broadcast against prices
+            atr: Average True Range per price (optional, for volatility-based sizing)
+            
+        Returns:
+            Tuple of (quantities as int64 array, position_values array)
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        max_position_value = np.asarray(portfolio_values, dtype=np.float64) * self.max_position_size
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Higher ATR = smaller position; NaN or non-positive ATR leaves the size unchanged
+            if atr is not None:
+                atr = np.asarray(atr, dtype=np.float64)
+                max_position_value = max_position_value * np.where(atr > 0, 1.0 / (1.0 + atr / prices), 1.0)
+            
+            valid = prices >= 1e-8
+            quantity = np.where(valid, np.trunc(max_position_value / np.where(valid, prices, 1.0)), 0.0)
+        
+        quantity = quantity.astype(np.int64)
+        return quantity, quantity * np.where(valid, prices, 0.0)
+    
     def calculate_stop_loss_and_take_profit(
         self, 
         entry_price: float, 
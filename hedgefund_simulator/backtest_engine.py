@@ -2,13 +2,13 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
-import matplotlib.pyplot as plt
 from hedgefund_simulator.agents import (
     MarketDataAgent, 
     QuantAgent, 
     RiskManagerAgent, 
     PortfolioManagerAgent
 )
+from hedgefund_simulator.utils.data_utils import BarPanel
 
 class BacktestEngine:
     """Backtesting engine for simulating and evaluating trading strategies."""
@@ -78,44 +78,41 @@ class BacktestEngine:
         
         # Load and prepare data
         data = self.load_data(ticker)
+        panel = BarPanel(data)
         
         # Initialize portfolio
         self.portfolio.initialize_portfolio(initial_cash)
         
+        # Strategy signals only look backwards, so one pass over the full
+        # history yields the same value at bar i as re-running on data[:i+1]
+        combined = self.quant_agent.combined_signal(data)
+        
+        # Calculate ATR for position sizing (using 14-day ATR)
+        atr_values = panel['ATR'] if 'ATR' in panel else None
+        close = panel['Close']
+        
         # Run backtest
-        for i in range(1, len(data)):
-            current_date = data.index[i]
-            previous_date = data.index[i-1]
-            
-            # Get current and previous data
-            current_data = data.iloc[i]
-            previous_data = data.iloc[i-1]
-            
-            # Generate trading signals
-            signals = self.quant_agent.process(data[:i+1])
+        for i in range(1, len(panel)):
+            current_date = panel.index[i]
+            current_price = float(close[i])
             
             # Get current position for this ticker
             current_position = self.portfolio.positions.get(ticker, {})
             
-            # Calculate ATR for position sizing (using 14-day ATR)
-            atr = None
-            if 'ATR' in data.columns:
-                atr = data['ATR'].iloc[i]
-            
             # Get risk-managed signal
             risk_signal = self.risk_manager.process(
-                signal=signals['combined'].iloc[-1] if not signals['combined'].empty else 0,
-                price_data=current_data,
+                signal=int(combined[i]) if len(combined) > i else 0,
+                price_data=current_price,
                 current_position=current_position,
                 portfolio_value=self.portfolio.calculate_portfolio_value()['total_value'],
-                atr=atr
+                atr=atr_values[i] if atr_values is not None else None
             )
             
             # Execute trade if needed
             trade_result = self.portfolio.process(
                 ticker=ticker,
                 signal=risk_signal,
-                price_data=current_data,
+                price_data=current_price,
                 timestamp=current_date
             )
             
@@ -301,6 +298,8 @@ class BacktestEngine:
             print("No results to plot. Run backtest first.")
             return
         
+        import matplotlib.pyplot as plt
+        
         try:
             # Create figure with two subplots
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10), gridspec_kw={'height_ratios': [3, 1]})
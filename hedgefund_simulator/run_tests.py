@@ -106,24 +106,29 @@ def run_linters() -> bool:
         print("flake8 not found. Install with: pip install flake8")
         return False
     
-    # Run flake8
+    # Run flake8 in-process to avoid a second interpreter start-up
     project_root = os.path.dirname(os.path.abspath(__file__))
-    flake8_cmd = [
-        'python', '-m', 'flake8',
+    flake8_args = [
         '--max-line-length=120',
         '--exclude=.git,__pycache__,venv,env,.venv,build,dist',
         project_root
     ]
     
     print("\nRunning flake8...")
-    flake8_result = subprocess.run(flake8_cmd)
+    try:
+        from flake8.main.application import Application
+        app = Application()
+        app.run(flake8_args)
+        flake8_rc = app.exit_code()
+    except ImportError:
+        # Older flake8 layouts: fall back to the current interpreter's module runner
+        flake8_rc = subprocess.run([sys.executable, '-m', 'flake8'] + flake8_args).returncode
     
     # Run mypy if installed
     try:
-        import mypy
+        from mypy import api as mypy_api
         print("\nRunning mypy...")
-        mypy_cmd = [
-            'python', '-m', 'mypy',
+        mypy_args = [
             '--ignore-missing-imports',
             '--disallow-untyped-defs',
             '--no-implicit-optional',
@@ -133,13 +138,15 @@ def run_linters() -> bool:
             '--no-warn-no-return',
             project_root
         ]
-        mypy_result = subprocess.run(mypy_cmd)
-        mypy_passed = mypy_result.returncode == 0
+        mypy_stdout, mypy_stderr, mypy_rc = mypy_api.run(mypy_args)
+        sys.stdout.write(mypy_stdout)
+        sys.stderr.write(mypy_stderr)
+        mypy_passed = mypy_rc == 0
     except ImportError:
         print("mypy not found. Install with: pip install mypy")
         mypy_passed = True  # Don't fail if mypy isn't installed
     
-    return flake8_result.returncode == 0 and mypy_passed
+    return flake8_rc == 0 and mypy_passed
 
 def run_security_checks() -> bool:
     """Run security checks using bandit.
@@ -158,8 +165,10 @@ def run_security_checks() -> bool:
         return True  # Don't fail if bandit isn't installed
     
     project_root = os.path.dirname(os.path.abspath(__file__))
+    # bandit's CLI entry point parses sys.argv and calls sys.exit, so it
+    # keeps running as a subprocess, but under the same interpreter.
     bandit_cmd = [
-        'python', '-m', 'bandit',
+        sys.executable, '-m', 'bandit',
         '-r',  # Recursive
         '-ll',  # Basic reporting level
         '-iii',  # Info issues included
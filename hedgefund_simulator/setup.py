@@ -35,6 +35,11 @@ setup(
             "mypy>=0.9",
             "flake8>=3.9",
         ],
+        "perf": [
+            "numba>=0.56.0",
+            "httpx[http2]>=0.23.0",
+            "tsdownsample>=0.1.3",
+        ],
         "docs": [
             "sphinx>=4.0",
             "sphinx-rtd-theme>=0.5.0",
@@ -44,6 +49,7 @@ setup(
     entry_points={
         "console_scripts": [
             "hedgefund-simulator=hedgefund_simulator.cli:main",
+            "run-hedgefund-example=hedgefund_simulator.example:main",
         ],
     },
     include_package_data=True,
@@ -9,6 +9,8 @@ portfolio management, and backtesting.
 import os
 import sys
 import logging
+from types import MappingProxyType
+from typing import List, Optional
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -35,49 +37,73 @@ from hedgefund_simulator.utils import config_utils
 config_utils.setup_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
-def run_integration_test():
-    """Run an integration test of the hedge fund simulator."""
+# Base configurations for the integration run. These are built once at import
+# time and exposed read-only so an agent holding a reference cannot mutate them.
+_BASE_MARKET = MappingProxyType({
+    **MARKET_DATA_CONFIG,
+    'interval': '1d',
+    'indicators': ['sma', 'rsi', 'bbands', 'macd', 'atr']
+})
+
+_QUANT = MappingProxyType({
+    **QUANT_CONFIG,
+    'strategy': 'moving_average_crossover',
+    'fast_ma': 10,
+    'slow_ma': 30,
+    'rsi_overbought': 70,
+    'rsi_oversold': 30
+})
+
+_RISK = MappingProxyType({
+    **RISK_CONFIG,
+    'max_position_size': 0.2,  # 20% of portfolio per position
+    'max_portfolio_risk': 0.02,  # 2% risk per trade
+    'stop_loss_pct': 0.05,  # 5% stop loss
+    'take_profit_pct': 0.10  # 10% take profit
+})
+
+_PORTFOLIO = MappingProxyType({
+    **PORTFOLIO_CONFIG,
+    'initial_cash': 100000,  # $100,000 starting capital
+    'max_positions': 5,  # Max 5 open positions
+    'commission_pct': 0.001,  # 0.1% commission
+    'slippage_pct': 0.0005  # 0.05% slippage
+})
+
+_BACKTEST = MappingProxyType({
+    **BACKTEST_CONFIG,
+    'output_dir': 'backtest_results',
+    'save_plots': True,
+    'show_plots': False,
+    'save_trades': True
+})
+
+def run_integration_test(
+    tickers: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+):
+    """Run an integration test of the hedge fund simulator.
+    
+    Args:
+        tickers: Tickers to test with (default: AAPL and MSFT)
+        start_date: Start date in 'YYYY-MM-DD' format (default: 90 days ago)
+        end_date: End date in 'YYYY-MM-DD' format (default: today)
+    """
     logger.info("Starting integration test...")
     
-    # Override config for testing
+    # Only the market data window varies between runs; everything else is shared
     test_config = {
         'market_data': {
-            **MARKET_DATA_CONFIG,
-            'tickers': ['AAPL', 'MSFT'],  # Test with two tickers
-            'start_date': (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d'),
-            'end_date': datetime.now().strftime('%Y-%m-%d'),
-            'interval': '1d',
-            'indicators': ['sma', 'rsi', 'bbands', 'macd', 'atr']
-        },
-        'quant': {
-            **QUANT_CONFIG,
-            'strategy': 'moving_average_crossover',
-            'fast_ma': 10,
-            'slow_ma': 30,
-            'rsi_overbought': 70,
-            'rsi_oversold': 30
-        },
-        'risk': {
-            **RISK_CONFIG,
-            'max_position_size': 0.2,  # 20% of portfolio per position
-            'max_portfolio_risk': 0.02,  # 2% risk per trade
-            'stop_loss_pct': 0.05,  # 5% stop loss
-            'take_profit_pct': 0.10  # 10% take profit
-        },
-        'portfolio': {
-            **PORTFOLIO_CONFIG,
-            'initial_cash': 100000,  # $100,000 starting capital
-            'max_positions': 5,  # Max 5 open positions
-            'commission_pct': 0.001,  # 0.1% commission
-            'slippage_pct': 0.0005  # 0.05% slippage
+            **_BASE_MARKET,
+            'tickers': tickers or ['AAPL', 'MSFT'],  # Test with two tickers
+            'start_date': start_date or (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d'),
+            'end_date': end_date or datetime.now().strftime('%Y-%m-%d'),
         },
-        'backtest': {
-            **BACKTEST_CONFIG,
-            'output_dir': 'backtest_results',
-            'save_plots': True,
-            'show_plots': False,
-            'save_trades': True
-        }
+        'quant': _QUANT,
+        'risk': _RISK,
+        'portfolio': _PORTFOLIO,
+        'backtest': _BACKTEST
     }
     
     # Initialize agents
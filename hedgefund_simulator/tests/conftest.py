@@ -0,0 +1,13 @@
+"""Shared pytest fixtures for the Hedge Fund Simulator test suite."""
+
+import pytest
+
+from hedgefund_simulator.utils import config_utils
+
+
+@pytest.fixture(autouse=True)
+def reset_env_cache():
+    """Clear cached environment lookups so tests that patch env vars see fresh values."""
+    config_utils._reset_env_cache()
+    yield
+    config_utils._reset_env_cache()
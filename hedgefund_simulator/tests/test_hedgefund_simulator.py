@@ -5,13 +5,19 @@ This module contains unit tests and integration tests for the
 Hedge Fund Simulator components.
 """
 
+import asyncio
+import json
+import logging
 import os
 import sys
+import tempfile
 import unittest
+from unittest import mock
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -21,7 +27,13 @@ from hedgefund_simulator.agents.quant_agent import QuantAgent
 from hedgefund_simulator.agents.risk_manager_agent import RiskManagerAgent
 from hedgefund_simulator.agents.portfolio_manager_agent import PortfolioManagerAgent
 from hedgefund_simulator.backtest_engine import BacktestEngine
-from hedgefund_simulator.utils import data_utils, performance_metrics, plotting
+from hedgefund_simulator.utils import (
+    config_utils, data_utils, openai_cache, openai_utils, performance_metrics, plotting
+)
+
+def _chat_response(content):
+    """Minimal stand-in for an OpenAI chat completion response."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
 
 class TestMarketDataAgent(unittest.TestCase):
     """Test cases for the MarketDataAgent class."""
@@ -36,6 +48,7 @@ class TestMarketDataAgent(unittest.TestCase):
             'indicators': ['sma', 'rsi', 'bbands']
         }
         self.agent = MarketDataAgent(self.config)
+        self.rng = np.random.default_rng(42)
     
     def test_fetch_data(self):
         """Test fetching market data."""
@@ -53,13 +66,13 @@ class TestMarketDataAgent(unittest.TestCase):
         """Test adding technical indicators."""
         # Create sample data
         dates = pd.date_range(start='2023-01-01', periods=100)
-        prices = pd.Series(np.random.normal(100, 5, 100).cumsum(), index=dates)
+        prices = pd.Series(self.rng.normal(100, 5, 100).cumsum(), index=dates)
         df = pd.DataFrame({
             'open': prices * 0.99,
             'high': prices * 1.01,
             'low': prices * 0.98,
             'close': prices,
-            'volume': np.random.randint(1000000, 5000000, 100)
+            'volume': self.rng.integers(1000000, 5000000, 100)
         })
         
         # Add indicators
@@ -88,15 +101,15 @@ class TestQuantAgent(unittest.TestCase):
         self.agent = QuantAgent(self.config)
         
         # Create sample data
-        np.random.seed(42)
+        self.rng = np.random.default_rng(42)
         dates = pd.date_range(start='2023-01-01', periods=100)
-        close_prices = np.cumsum(np.random.randn(100)) + 100
+        close_prices = np.cumsum(self.rng.standard_normal(100)) + 100
         
         self.sample_data = pd.DataFrame({
             'close': close_prices,
             'sma_10': close_prices.rolling(10).mean(),
             'sma_30': close_prices.rolling(30).mean(),
-            'rsi_14': np.random.uniform(0, 100, 100),
+            'rsi_14': self.rng.uniform(0, 100, 100),
             'bb_upper': close_prices * 1.05,
             'bb_middle': close_prices,
             'bb_lower': close_prices * 0.95
@@ -131,6 +144,41 @@ class TestQuantAgent(unittest.TestCase):
         self.assertGreater(signals['strength'].iloc[10], 0)
 
 
+class TestQuantSignals(unittest.TestCase):
+    """Test cases for QuantAgent's signal generation on indicator columns."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.agent = QuantAgent({'fast_ma': 10, 'slow_ma': 30, 'rsi_overbought': 70, 'rsi_oversold': 30})
+    
+    def test_process_empty(self):
+        """process() should return empty signal series for an empty frame."""
+        empty = pd.DataFrame({'SMA_10': [], 'SMA_30': [], 'RSI': []}, dtype=float)
+        
+        signals = self.agent.process(empty)
+        
+        for name in ('ma_crossover', 'rsi', 'combined'):
+            self.assertTrue(signals[name].empty)
+    
+    def test_combined_signal_matches_process(self):
+        """The compiled signal kernel should agree with process()['combined']."""
+        rng = np.random.default_rng(42)
+        n = 3000
+        close = pd.Series(100 + np.cumsum(rng.normal(0, 1, n)))
+        rsi = rng.uniform(0, 100, n)
+        rsi[:14] = np.nan  # Warm-up
+        rsi[rng.choice(n, 50, replace=False)] = np.nan
+        data = pd.DataFrame({
+            'SMA_10': close.rolling(10).mean(),
+            'SMA_30': close.rolling(30).mean(),
+            'RSI': rsi
+        })
+        
+        expected = self.agent.process(data)['combined'].to_numpy()
+        
+        np.testing.assert_array_equal(self.agent.combined_signal(data), expected)
+
+
 class TestRiskManagerAgent(unittest.TestCase):
     """Test cases for the RiskManagerAgent class."""
     
@@ -148,8 +196,8 @@ class TestRiskManagerAgent(unittest.TestCase):
         self.agent = RiskManagerAgent(self.config)
         
         # Sample price data
-        np.random.seed(42)
-        self.prices = pd.Series(np.random.normal(100, 5, 100).cumsum() + 1000)
+        self.rng = np.random.default_rng(42)
+        self.prices = pd.Series(self.rng.normal(100, 5, 100).cumsum() + 1000)
     
     def test_calculate_position_size(self):
         """Test position size calculation."""
@@ -177,6 +225,19 @@ class TestRiskManagerAgent(unittest.TestCase):
             
             self.assertEqual(position_size, expected_size)
     
+    def test_calculate_position_size_batch(self):
+        """Test that batch position sizing matches the scalar calculation."""
+        prices = np.array([100.0, 50.0, 200.0, 0.0])
+        portfolio_values = np.array([100000.0, 50000.0, 10000.0, 10000.0])
+        atr = np.array([2.0, 0.0, 5.0, 0.0])
+        
+        quantities, values = self.agent.calculate_position_size_batch(prices, portfolio_values, atr)
+        
+        for i in range(len(prices)):
+            quantity, value = self.agent.calculate_position_size(prices[i], portfolio_values[i], atr[i])
+            self.assertEqual(quantities[i], quantity)
+            self.assertAlmostEqual(values[i], value)
+    
     def test_stop_loss_take_profit(self):
         """Test stop loss and take profit calculation."""
         entry_price = 100
@@ -289,12 +350,14 @@ class TestBacktestEngine(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
+        rng = np.random.default_rng(42)
+        
         # Create mock agents
         class MockMarketDataAgent:
             def fetch_data(self):
                 # Create sample price data
                 dates = pd.date_range(start='2023-01-01', periods=100)
-                close_prices = np.cumsum(np.random.randn(100)) + 100
+                close_prices = np.cumsum(rng.standard_normal(100)) + 100
                 
                 return {
                     'AAPL': pd.DataFrame({
@@ -302,10 +365,10 @@ class TestBacktestEngine(unittest.TestCase):
                         'high': close_prices * 1.01,
                         'low': close_prices * 0.98,
                         'close': close_prices,
-                        'volume': np.random.randint(1000000, 5000000, 100),
+                        'volume': rng.integers(1000000, 5000000, 100),
                         'sma_10': close_prices.rolling(10).mean(),
                         'sma_30': close_prices.rolling(30).mean(),
-                        'rsi_14': np.random.uniform(30, 70, 100)
+                        'rsi_14': rng.uniform(30, 70, 100)
                     }, index=dates)
                 }
         
@@ -313,8 +376,8 @@ class TestBacktestEngine(unittest.TestCase):
             def generate_signals(self, data):
                 # Generate random signals
                 signals = pd.DataFrame(index=data.index)
-                signals['signal'] = np.random.choice([-1, 0, 1], size=len(data), p=[0.2, 0.6, 0.2])
-                signals['strength'] = np.random.uniform(0.5, 1.0, len(data))
+                signals['signal'] = rng.choice([-1, 0, 1], size=len(data), p=[0.2, 0.6, 0.2])
+                signals['strength'] = rng.uniform(0.5, 1.0, len(data))
                 signals['timestamp'] = data.index
                 return signals
         
@@ -404,8 +467,8 @@ class TestPerformanceMetrics(unittest.TestCase):
     def test_sharpe_ratio(self):
         """Test Sharpe ratio calculation."""
         # Create sample returns (5% annual return, 10% annual volatility)
-        np.random.seed(42)
-        daily_returns = np.random.normal(0.0002, 0.0063, 252)  # ~5% annual return, 10% vol
+        rng = np.random.default_rng(42)
+        daily_returns = rng.normal(0.0002, 0.0063, 252)  # ~5% annual return, 10% vol
         
         # Calculate Sharpe ratio (risk-free rate = 0 for simplicity)
         sharpe = performance_metrics.sharpe_ratio(daily_returns, risk_free_rate=0.0, periods=252)
@@ -423,6 +486,58 @@ class TestPerformanceMetrics(unittest.TestCase):
         
         # Expected drawdown: (120 - 90) / 120 = 0.25 or 25%
         self.assertAlmostEqual(mdd, 0.25)
+    
+    def test_compute_all_metrics(self):
+        """Batched metrics should agree with the individual metric functions."""
+        rng = np.random.default_rng(42)
+        prices = pd.Series(100 * np.cumprod(1 + rng.normal(0.0005, 0.01, 300)))
+        returns = performance_metrics.calculate_returns(prices)
+        trades = pd.DataFrame({'pnl': [120.0, -40.0, 15.0, -60.0, 80.0]})
+        
+        metrics = performance_metrics.compute_all_metrics(returns, prices, trades, risk_free_rate=0.02)
+        
+        self.assertAlmostEqual(metrics['sharpe_ratio'], performance_metrics.calculate_sharpe_ratio(returns, 0.02))
+        self.assertAlmostEqual(metrics['sortino_ratio'], performance_metrics.calculate_sortino_ratio(returns, 0.02))
+        self.assertAlmostEqual(metrics['max_drawdown'], performance_metrics.calculate_max_drawdown(prices))
+        self.assertAlmostEqual(metrics['calmar_ratio'], performance_metrics.calculate_calmar_ratio(returns, prices))
+        self.assertAlmostEqual(metrics['value_at_risk'], performance_metrics.calculate_value_at_risk(returns))
+        self.assertAlmostEqual(metrics['win_rate'], 0.6)
+        self.assertAlmostEqual(metrics['profit_factor'], 215.0 / 100.0)
+    
+    def test_rolling_metrics(self):
+        """Rolling metrics should equal the scalar metric on each window."""
+        rng = np.random.default_rng(42)
+        returns = rng.normal(0.0005, 0.01, 120)
+        prices = 100 * np.cumprod(1 + returns)
+        window = 30
+        
+        sharpe = performance_metrics.rolling_sharpe(returns, window)
+        mdd = performance_metrics.rolling_max_drawdown(prices, window)
+        
+        self.assertTrue(np.isnan(sharpe[:window - 1]).all())
+        self.assertTrue(np.isnan(mdd[:window - 1]).all())
+        for i in range(window - 1, len(returns)):
+            start = i - window + 1
+            self.assertAlmostEqual(sharpe[i], performance_metrics.calculate_sharpe_ratio(returns[start:i + 1]))
+            self.assertAlmostEqual(mdd[i], performance_metrics.calculate_max_drawdown(prices[start:i + 1]))
+    
+    def test_streaming_metrics(self):
+        """Incremental metrics should match the batch calculation, also after merging segments."""
+        rng = np.random.default_rng(42)
+        returns = rng.normal(0.0005, 0.01, 200)
+        prices = 100 * np.cumprod(1 + returns)
+        
+        stream = performance_metrics.StreamingMetrics(risk_free_rate=0.02)
+        first, second = performance_metrics.StreamingMetrics(0.02), performance_metrics.StreamingMetrics(0.02)
+        for i, (r, price) in enumerate(zip(returns, prices)):
+            stream.update(r, price)
+            (first if i < 120 else second).update(r, price)
+        first.merge(second)
+        
+        for metrics in (stream, first):
+            self.assertAlmostEqual(metrics.sharpe, performance_metrics.calculate_sharpe_ratio(returns, 0.02))
+            self.assertAlmostEqual(metrics.sortino, performance_metrics.calculate_sortino_ratio(returns, 0.02))
+            self.assertAlmostEqual(metrics.max_drawdown, performance_metrics.calculate_max_drawdown(prices))
 
 
 class TestDataUtils(unittest.TestCase):
@@ -454,6 +569,524 @@ class TestDataUtils(unittest.TestCase):
         
         # Check if calculated RSI is close to expected (allowing for small rounding differences)
         self.assertAlmostEqual(rsi.iloc[-1], expected_rsi, delta=0.1)
+    
+    def test_rsi_gap(self):
+        """A missing close should not make RSI NaN for the rest of the series."""
+        close = 100 + np.cumsum(np.sin(np.arange(60) / 3.0))
+        close[5] = np.nan
+        
+        rsi = data_utils.calculate_rsi(pd.DataFrame({'Close': close}), window=14)
+        
+        # The two changes touching the gap are skipped, delaying warm-up by two bars
+        self.assertTrue(rsi.iloc[:16].isna().all())
+        self.assertTrue(np.isfinite(rsi.iloc[16:]).all())
+    
+    def test_obv_missing_volume(self):
+        """A missing volume should add nothing to OBV instead of turning it NaN."""
+        data = pd.DataFrame({'Close': [1, 2, 3, 2, 3], 'Volume': [10, np.nan, 5, 5, 5]})
+        
+        obv = data_utils.calculate_obv(data)
+        
+        np.testing.assert_array_equal(obv.to_numpy(), [0, 0, 5, 0, 5])
+    
+    def test_atr_gap(self):
+        """ATR should be NaN only while a missing bar is inside the window."""
+        close = 100 + np.cumsum(np.sin(np.arange(60) / 3.0))
+        data = pd.DataFrame({'High': close + 1, 'Low': close - 1, 'Close': close})
+        data.iloc[5] = np.nan
+        
+        atr = data_utils.calculate_atr(data, window=14)
+        
+        # Bar 5 has no true range; bar 6 still has high - low
+        self.assertTrue(atr.iloc[:19].isna().all())
+        self.assertTrue(np.isfinite(atr.iloc[19:]).all())
+    
+    def test_bollinger_bands_gap(self):
+        """Bollinger Bands should match pandas rolling windows around a missing close."""
+        close = pd.Series(100 + np.cumsum(np.sin(np.arange(60) / 3.0)))
+        close.iloc[5] = np.nan
+        
+        bands = data_utils.calculate_bollinger_bands(pd.DataFrame({'Close': close}), window=20)
+        
+        middle = close.rolling(20).mean()
+        std = close.rolling(20).std()
+        pd.testing.assert_series_equal(bands['middle'], middle, check_names=False)
+        pd.testing.assert_series_equal(bands['upper'], middle + 2 * std, check_names=False)
+        self.assertTrue(np.isfinite(bands['lower'].iloc[25:]).all())
+    
+    def test_macd_gap(self):
+        """MACD should hold its EMAs over missing closes, like ewm(ignore_na=True)."""
+        close = pd.Series(100 + np.cumsum(np.sin(np.arange(60) / 3.0)))
+        close.iloc[[0, 5]] = np.nan
+        
+        macd = data_utils.calculate_macd(pd.DataFrame({'Close': close}))
+        
+        fast = close.ewm(span=12, adjust=False, ignore_na=True).mean()
+        slow = close.ewm(span=26, adjust=False, ignore_na=True).mean()
+        signal = (fast - slow).ewm(span=9, adjust=False, ignore_na=True).mean()
+        pd.testing.assert_series_equal(macd['macd'], fast - slow, check_names=False)
+        pd.testing.assert_series_equal(macd['signal'], signal, check_names=False)
+    
+    def test_add_indicators_gap(self):
+        """One missing bar should not make the indicators NaN for the rest of the series."""
+        close = 100 + np.cumsum(np.sin(np.arange(60) / 3.0))
+        data = pd.DataFrame({
+            'Open': close,
+            'High': close + 1,
+            'Low': close - 1,
+            'Close': close,
+            'Volume': np.arange(60) * 1000
+        }, index=pd.date_range(start='2020-01-01', periods=60))
+        data.iloc[5, :4] = np.nan
+        
+        result = data_utils.add_technical_indicators(data)
+        
+        self.assertFalse(result.iloc[-1].isna().any())
+        gapped = data['Close']
+        np.testing.assert_allclose(result['SMA_20'], gapped.rolling(20).mean(), rtol=1e-6)
+        np.testing.assert_allclose(
+            result['EMA_12'], gapped.ewm(span=12, adjust=False, ignore_na=True).mean(), rtol=1e-6
+        )
+    
+    def test_add_indicators_batch(self):
+        """Test that batch indicators match the per-ticker calculation."""
+        # Create sample data with different history lengths
+        dates = pd.date_range(start='2020-01-01', periods=120)
+        close = 100 + np.cumsum(np.sin(np.arange(120) / 5.0))
+        data = pd.DataFrame({
+            'Open': close,
+            'High': close + 1,
+            'Low': close - 1,
+            'Close': close,
+            'Volume': np.arange(120) * 1000
+        }, index=dates)
+        frames = {'AAA': data, 'BBB': data.iloc[:80] * 2}
+        
+        batch = data_utils.add_indicators_batch(frames)
+        
+        # Check each ticker against the single-ticker path
+        for ticker, df in frames.items():
+            pd.testing.assert_frame_equal(batch[ticker], data_utils.add_technical_indicators(df))
+
+
+class TestConfigUtils(unittest.TestCase):
+    """Test cases for configuration utilities."""
+    
+    def test_setup_logging_configured_root(self):
+        """setup_logging should not open a log file when logging is already configured."""
+        root = logging.getLogger()
+        handler = logging.NullHandler()
+        root.addHandler(handler)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                log_file = os.path.join(tmp, 'simulator.log')
+                with mock.patch.dict(os.environ, {'HFS_LOG_FILE': log_file}):
+                    config_utils.setup_logging()
+                    config_utils.setup_logging()
+                
+                self.assertFalse(os.path.exists(log_file))
+        finally:
+            root.removeHandler(handler)
+
+
+class TestPlotting(unittest.TestCase):
+    """Test cases for plotting helpers."""
+    
+    def test_downsample(self):
+        """Downsampling should keep the endpoints and the extremes of the series."""
+        rng = np.random.default_rng(42)
+        dates = pd.date_range(start='2000-01-01', periods=20000, freq='h')
+        series = pd.Series(np.cumsum(rng.normal(0, 1, 20000)), index=dates)
+        
+        reduced = plotting._downsample(series, 500)
+        
+        self.assertLessEqual(len(reduced), 502)
+        self.assertTrue(reduced.index.is_monotonic_increasing)
+        self.assertEqual(reduced.index[0], dates[0])
+        self.assertEqual(reduced.index[-1], dates[-1])
+        self.assertEqual(reduced.max(), series.max())
+        self.assertEqual(reduced.min(), series.min())
+        self.assertIs(plotting._downsample(series, None), series)
+    
+    def test_monthly_returns_matrix(self):
+        """Monthly returns should compound within each month and follow edits to the series."""
+        dates = pd.date_range(start='2023-11-01', periods=90, freq='D')
+        returns = pd.Series(np.full(90, 0.001), index=dates)
+        
+        matrix = plotting._monthly_returns_matrix(returns)
+        
+        self.assertEqual(list(matrix.index), [2023, 2024])
+        self.assertAlmostEqual(matrix.loc[2023, 'Nov'], 1.001 ** 30 - 1)
+        self.assertTrue(np.isnan(matrix.loc[2024, 'Mar']))
+        
+        returns.iloc[-1] = 0.05
+        self.assertAlmostEqual(plotting._monthly_returns_matrix(returns).loc[2024, 'Jan'], 1.001 ** 28 * 1.05 - 1)
+
+
+class TestOpenAIUtils(unittest.TestCase):
+    """Test cases for the OpenAI helpers, run against a fake client."""
+    
+    def setUp(self):
+        """Enable OpenAI features with a fake client."""
+        self.client = mock.MagicMock()
+        patcher = mock.patch.object(openai_utils, 'get_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_analyze_sentiments_keeps_order(self):
+        """Concurrent results should follow the input order, with failures reported per text."""
+        async def fake_create(tokens, **kwargs):
+            text = kwargs['messages'][1]['content']
+            if 'halted' in text:
+                raise RuntimeError('request failed')
+            await asyncio.sleep(0.01 if 'beat' in text else 0)
+            sentiment = 'positive' if 'beat' in text else 'negative'
+            return _chat_response(json.dumps({'sentiment': sentiment, 'confidence': 0.8}))
+        
+        texts = ['Earnings beat estimates', 'Trading halted', 'Guidance cut']
+        with mock.patch.object(openai_utils, '_chat_create_async', new=fake_create):
+            results = asyncio.run(openai_utils.analyze_sentiments(texts, enable_cache=False))
+        
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]['sentiment'], 'positive')
+        self.assertFalse(results[1]['success'])
+        self.assertEqual(results[2]['sentiment'], 'negative')
+    
+    def _fake_clock(self):
+        """Patch the dispatcher's clock and sleep; sleeping advances the clock."""
+        clock = SimpleNamespace(now=1000.0, sleeps=[])
+        
+        async def fake_sleep(seconds):
+            clock.sleeps.append(seconds)
+            clock.now += seconds
+        
+        for patcher in (
+            mock.patch.object(openai_utils.time, 'monotonic', side_effect=lambda: clock.now),
+            mock.patch.object(openai_utils.asyncio, 'sleep', new=fake_sleep)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return clock
+    
+    def test_dispatcher_refills_over_time(self):
+        """Once the request bucket is empty, a request should wait for it to refill."""
+        clock = self._fake_clock()
+        dispatcher = openai_utils._RateLimitedDispatcher(max_requests_per_minute=2, max_tokens_per_minute=1000)
+        
+        async def run():
+            for _ in range(3):
+                await dispatcher.acquire(10)
+        
+        asyncio.run(run())
+        
+        # Two requests fit the full bucket; the third waits 60 / 2 seconds for one to refill
+        self.assertEqual(len(clock.sleeps), 1)
+        self.assertAlmostEqual(clock.sleeps[0], 30.0)
+    
+    def test_dispatcher_pauses_after_rate_limit(self):
+        """A 429 should hold back the next request for the Retry-After duration."""
+        clock = self._fake_clock()
+        dispatcher = openai_utils._RateLimitedDispatcher()
+        error = RuntimeError('rate limited')
+        error.status_code = 429
+        error.response = SimpleNamespace(headers={'retry-after': '5'})
+        
+        async def rate_limited():
+            raise error
+        
+        async def ok():
+            return 'ok'
+        
+        async def run():
+            with self.assertRaises(RuntimeError):
+                await dispatcher.submit(rate_limited, tokens=10)
+            return await dispatcher.submit(ok, tokens=10)
+        
+        self.assertEqual(asyncio.run(run()), 'ok')
+        self.assertEqual(clock.sleeps, [5.0])
+    
+    def test_dispatcher_caps_oversized_requests(self):
+        """A request larger than the token bucket should still go through."""
+        clock = self._fake_clock()
+        dispatcher = openai_utils._RateLimitedDispatcher(max_tokens_per_minute=1000)
+        
+        asyncio.run(dispatcher.acquire(5000))
+        
+        self.assertEqual(clock.sleeps, [])
+        self.assertAlmostEqual(dispatcher._available_tokens, 0.0)
+    
+    def _fake_batch(self):
+        """Make the fake client report a completed batch with out-of-order, partial results."""
+        def success(i, sentiment):
+            content = json.dumps({'sentiment': sentiment, 'confidence': 0.9})
+            body = {'choices': [{'message': {'content': content}}]}
+            return {'custom_id': f'req-{i}', 'response': {'status_code': 200, 'body': body}, 'error': None}
+        
+        output = [
+            success(10, 'positive'),
+            {'custom_id': 'req-2', 'response': {'status_code': 400, 'body': {'error': 'bad request'}}, 'error': None},
+            success(0, 'negative'),
+        ]
+        errors = [{'custom_id': 'req-1', 'response': None, 'error': {'message': 'server error'}}]
+        files = {
+            'file-out': "\n".join(json.dumps(r) for r in output),
+            'file-err': "\n".join(json.dumps(r) for r in errors)
+        }
+        
+        self.client.files.create.return_value = SimpleNamespace(id='file-in')
+        self.client.batches.create.return_value = SimpleNamespace(id='batch-1')
+        self.client.batches.retrieve.return_value = SimpleNamespace(
+            status='completed', output_file_id='file-out', error_file_id='file-err'
+        )
+        self.client.files.content.side_effect = lambda file_id: SimpleNamespace(text=files[file_id])
+    
+    def test_wait_for_batch_orders_by_input_position(self):
+        """Records from both result files should come back sorted numerically by custom_id."""
+        self._fake_batch()
+        
+        records = openai_utils.wait_for_batch('batch-1', poll_interval=0)
+        
+        self.assertEqual([r['custom_id'] for r in records], ['req-0', 'req-1', 'req-2', 'req-10'])
+    
+    def test_analyze_sentiments_batch(self):
+        """Batch results should map back to their texts, with errors and gaps reported per text."""
+        self._fake_batch()
+        texts = [f'headline {i}' for i in range(12)]
+        
+        results = openai_utils.analyze_sentiments_batch(texts, poll_interval=0)
+        
+        submitted = self.client.files.create.call_args.kwargs['file'][1].decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['custom_id'] for line in submitted], [f'req-{i}' for i in range(12)])
+        self.assertEqual(len(results), 12)
+        self.assertEqual(results[0]['sentiment'], 'negative')
+        self.assertEqual(results[10]['sentiment'], 'positive')
+        self.assertIn('server error', results[1]['error'])
+        self.assertIn('bad request', results[2]['error'])
+        for i in list(range(3, 10)) + [11]:
+            self.assertFalse(results[i]['success'])
+            self.assertIn('No result returned', results[i]['error'])
+    
+    def test_pack_texts(self):
+        """Packs should respect both the pack size and the model's context window."""
+        texts = [f'headline {i}' for i in range(45)]
+        packs = openai_utils._pack_texts(texts, 20, 'gpt-3.5-turbo')
+        self.assertEqual([len(p) for p in packs], [20, 20, 5])
+        self.assertEqual([t for p in packs for t in p], texts)
+        
+        # About 3000 tokens each, so only two fit gpt-4's 8192-token window at a time
+        long_texts = ['x' * 12000] * 5
+        packs = openai_utils._pack_texts(long_texts, 20, 'gpt-4')
+        self.assertEqual([len(p) for p in packs], [2, 2, 1])
+    
+    def test_analyze_sentiments_packed(self):
+        """Packed results should follow the input order and flag texts the model skipped."""
+        async def fake_create(tokens, **kwargs):
+            prompt = kwargs['messages'][1]['content']
+            count = prompt.count('Text ')
+            # Drop the last entry of every pack
+            items = [{'sentiment': 'positive', 'confidence': 0.7}] * (count - 1)
+            return _chat_response(json.dumps({'results': items}))
+        
+        texts = [f'headline {i}' for i in range(5)]
+        with mock.patch.object(openai_utils, '_chat_create_async', new=fake_create):
+            results = asyncio.run(openai_utils.analyze_sentiments_packed(texts, pack_size=3))
+        
+        self.assertEqual(len(results), 5)
+        self.assertEqual([r['success'] for r in results], [True, True, False, True, False])
+    
+    def test_sentiment_cache_is_scoped_to_ticker(self):
+        """A paraphrase should hit the semantic cache for the same ticker only."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        # Every text embeds identically, so only the scope keeps tickers apart
+        embed = mock.Mock(return_value=[1.0, 0.0])
+        cache = openai_cache.ResponseCache(path=Path(tmp.name) / 'cache.sqlite3', embed=embed)
+        chat = mock.Mock(return_value=_chat_response(json.dumps({'sentiment': 'positive', 'confidence': 0.9})))
+        
+        with mock.patch.object(openai_utils, '_response_cache', cache), \
+                mock.patch.object(openai_utils, '_chat_create', chat):
+            openai_utils.analyze_sentiment('Apple beats estimates', ticker='AAPL')
+            openai_utils.analyze_sentiment('Apple tops estimates', ticker='AAPL')
+            self.assertEqual(chat.call_count, 1)
+            
+            openai_utils.analyze_sentiment('Apple tops estimates', ticker='MSFT')
+            self.assertEqual(chat.call_count, 2)
+        
+        # Only the raw text is embedded, not the templated prompt
+        self.assertEqual(embed.call_args_list[0], mock.call('Apple beats estimates'))
+    
+    def test_client_uses_pooled_transport(self):
+        """The client should be built once per API key, on the tuned connection pool."""
+        openai_utils._create_client.cache_clear()
+        self.addCleanup(openai_utils._create_client.cache_clear)
+        
+        with mock.patch.object(openai_utils.atexit, 'register') as register:
+            client = openai_utils._create_client('sk-test')
+            self.assertIs(openai_utils._create_client('sk-test'), client)
+        
+        http_client = client._client
+        self.addCleanup(http_client.close)
+        register.assert_called_once_with(http_client.close)
+        self.assertEqual(http_client.timeout.connect, 5.0)
+        pool = http_client._transport._pool
+        self.assertEqual(pool._max_connections, 64)
+        self.assertEqual(pool._max_keepalive_connections, 32)
+        self.assertEqual(pool._http2, openai_utils.HTTP2_AVAILABLE)
+    
+    def test_chat_create_retries_transient_errors(self):
+        """Rate limits should be retried after their Retry-After; other errors raised at once."""
+        request = openai_utils.httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+        response = openai_utils.httpx.Response(429, headers={'retry-after': '0'}, request=request)
+        create = self.client.chat.completions.create
+        
+        create.side_effect = [openai_utils.RateLimitError('slow down', response=response, body=None), 'ok']
+        self.assertEqual(openai_utils._chat_create(model='gpt-4', messages=[]), 'ok')
+        self.assertEqual(create.call_count, 2)
+        
+        create.side_effect = ValueError('bad request')
+        with self.assertRaises(ValueError):
+            openai_utils._chat_create(model='gpt-4', messages=[])
+        self.assertEqual(create.call_count, 3)
+    
+    def test_explain_trade_reuses_similar_trades(self):
+        """Trades whose indicators agree to 2 significant figures should share one explanation."""
+        openai_utils.clear_trade_explanation_cache()
+        self.addCleanup(openai_utils.clear_trade_explanation_cache)
+        chat = mock.Mock(return_value=_chat_response('Oversold bounce.'))
+        
+        with mock.patch.object(openai_utils, '_chat_create', chat):
+            first = openai_utils.explain_trade('AAPL', 'buy', 150.0, 10, {'RSI': 29.61, 'trend': True},
+                                               enable_cache=False)
+            second = openai_utils.explain_trade('AAPL', 'buy', 152.5, 20, {'RSI': 29.84, 'trend': True},
+                                                enable_cache=False)
+            self.assertEqual(chat.call_count, 1)
+            
+            openai_utils.explain_trade('AAPL', 'sell', 152.5, 20, {'RSI': 29.84, 'trend': True}, enable_cache=False)
+            openai_utils.explain_trade('AAPL', 'buy', 152.5, 20, {'RSI': 31.0, 'trend': True}, enable_cache=False)
+            self.assertEqual(chat.call_count, 3)
+        
+        self.assertEqual(second['explanation'], first['explanation'])
+        self.assertEqual((second['price'], second['quantity']), (152.5, 20))
+    
+    def test_async_client_per_event_loop(self):
+        """Each event loop should get its own async client, reused within the loop."""
+        async def clients():
+            return openai_utils.get_async_client(), openai_utils.get_async_client()
+        
+        with mock.patch.object(openai_utils, '_configured_api_key', return_value='sk-test'):
+            first, again = asyncio.run(clients())
+            second, _ = asyncio.run(clients())
+        
+        self.assertIs(first, again)
+        self.assertIsNot(first, second)
+        # Clients of finished loops are not kept around
+        self.assertLessEqual(len(openai_utils._async_clients), 1)
+        openai_utils._async_clients.clear()
+    
+    def test_prompt_templates(self):
+        """Templates should fill in their fields and leave braces in the inputs alone."""
+        with_ticker = openai_utils._sentiment_messages('Revenue {guidance} raised', ticker='AAPL')[1]['content']
+        no_ticker = openai_utils._sentiment_messages('Revenue {guidance} raised')[1]['content']
+        self.assertIn('Focus on the impact on AAPL stock.', with_ticker)
+        self.assertNotIn('Focus on', no_ticker)
+        self.assertIn('Text: Revenue {guidance} raised', no_ticker)
+        
+        packed = openai_utils._packed_sentiment_messages(['first', 'second'])[1]['content']
+        self.assertIn('each of the following 2 financial texts', packed)
+        self.assertIn('Text 2: second', packed)
+        self.assertIn('{"results": [...]}', packed)
+        
+        explain = openai_utils._explain_trade_messages('MSFT', 'sell', 412.5, 7, {'RSI': 74})[1]['content']
+        self.assertIn('Explain this SELL trade', explain)
+        self.assertIn('Price: $412.50', explain)
+        self.assertIn('- RSI: 74', explain)
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the OpenAI response cache."""
+    
+    def setUp(self):
+        """Set up a cache file in a temporary directory and a controllable clock."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'cache.sqlite3'
+        self.messages = [
+            {'role': 'system', 'content': 'You are an analyst.'},
+            {'role': 'user', 'content': 'Apple beats estimates'}
+        ]
+        
+        self.now = 1_000_000.0
+        patcher = mock.patch.object(openai_cache.time, 'time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_exact_hit(self):
+        """A repeated request should be answered from disk, also by a new cache instance."""
+        call = mock.Mock(return_value='response')
+        
+        cache = openai_cache.ResponseCache(path=self.path)
+        self.assertEqual(cache.cached_or_call('gpt-4', self.messages, call), 'response')
+        self.assertEqual(cache.cached_or_call('gpt-4', self.messages, call), 'response')
+        reopened = openai_cache.ResponseCache(path=self.path)
+        self.assertEqual(reopened.cached_or_call('gpt-4', self.messages, call), 'response')
+        
+        self.assertEqual(call.call_count, 1)
+        # A different model is a different request
+        cache.cached_or_call('gpt-4o', self.messages, call)
+        self.assertEqual(call.call_count, 2)
+    
+    def test_ttl_expiry(self):
+        """Responses older than the TTL should be ignored by both tiers."""
+        call = mock.Mock(return_value='response')
+        cache = openai_cache.ResponseCache(path=self.path, ttl=60, embed=lambda text: [1.0, 0.0])
+        paraphrase = [self.messages[0], {'role': 'user', 'content': 'Apple tops estimates'}]
+        
+        cache.cached_or_call('gpt-4', self.messages, call)
+        self.now += 30
+        cache.cached_or_call('gpt-4', self.messages, call)
+        cache.cached_or_call('gpt-4', paraphrase, call)
+        self.assertEqual(call.call_count, 1)
+        
+        self.now += 61
+        cache.cached_or_call('gpt-4', self.messages, call)
+        self.assertEqual(call.call_count, 2)
+        self.now += 61
+        cache.cached_or_call('gpt-4', paraphrase, call)
+        self.assertEqual(call.call_count, 3)    
+    def test_short_ttl_call_keeps_entries(self):
+        """A lookup with a short TTL should not evict entries that are fresh for the cache."""
+        call = mock.Mock(return_value='response')
+        cache = openai_cache.ResponseCache(path=self.path, ttl=3600, embed=lambda text: [1.0, 0.0])
+        other = [self.messages[0], {'role': 'user', 'content': 'Microsoft misses estimates'}]
+        
+        cache.cached_or_call('gpt-4', self.messages, call)
+        self.now += 100
+        cache.cached_or_call('gpt-4', other, call, ttl=10)
+        self.assertEqual(call.call_count, 2)
+        
+        # Both tiers still hold the first response
+        self.assertIsNotNone(cache.get_exact(openai_cache._request_hash('gpt-4', self.messages), 3600))
+        self.assertEqual(len(cache._entries), 2)
+        cache.cached_or_call('gpt-4', self.messages, call)
+        self.assertEqual(call.call_count, 2)
+    
+    def test_cached_or_call_async(self):
+        """The async variant should share the cache with the synchronous one."""
+        cache = openai_cache.ResponseCache(path=self.path)
+        calls = []
+        
+        async def call():
+            calls.append(1)
+            return 'response'
+        
+        async def run():
+            first = await cache.cached_or_call_async('gpt-4', self.messages, call)
+            second = await cache.cached_or_call_async('gpt-4', self.messages, call)
+            return first, second
+        
+        self.assertEqual(asyncio.run(run()), ('response', 'response'))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.cached_or_call('gpt-4', self.messages, mock.Mock()), 'response')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,59 @@
+"""Optional Numba support for the numeric kernels in the utils package.
+
+If numba is installed, ``njit``, ``prange`` and ``jitclass`` are the real Numba
+objects. Otherwise ``njit`` and ``jitclass`` become no-op decorators and
+``prange`` falls back to ``range``, so every kernel still runs (slowly) as
+plain Python.
+"""
+
+from typing import List
+
+try:
+    from numba import njit, prange
+    from numba.experimental import jitclass
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        """No-op stand-in for ``numba.njit`` when numba is not installed."""
+        # Bare usage: @njit
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        # Parameterised usage: @njit(cache=True) / @njit('sig', ...)
+        def decorator(func):
+            return func
+        return decorator
+
+    prange = range  # type: ignore[misc]
+
+    def jitclass(*args, **kwargs):  # type: ignore[no-redef]
+        """No-op stand-in for ``numba.experimental.jitclass`` when numba is not installed."""
+        def decorator(cls):
+            return cls
+        return decorator
+
+
+def _float_sigs(template: str) -> List[str]:
+    """Expand a Numba signature template into float32 and float64 variants.
+    
+    ``{t}`` is replaced by the float type and ``{ro}`` / ``{ro2}`` by a
+    read-only 1-D / 2-D array of it; inputs are declared read-only because pandas hands out
+    read-only views under copy-on-write, and writable arrays still match.
+    
+    Kernels declared with explicit signatures are compiled eagerly at import
+    and, with ``cache=True``, loaded from Numba's on-disk cache afterwards, so
+    the first kernel call no longer pays the JIT compile cost.
+    """
+    return [
+        template.format(
+            t=t,
+            ro=f'Array({t}, 1, "A", readonly=True)',
+            ro2=f'Array({t}, 2, "A", readonly=True)',
+        )
+        for t in ('float32', 'float64')
+    ]
+
+
+__all__ = ['njit', 'prange', 'jitclass', 'NUMBA_AVAILABLE']
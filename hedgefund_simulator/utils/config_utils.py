@@ -1,9 +1,13 @@
 """Configuration and environment variable utilities for the hedge fund simulator."""
 
+import atexit
 import os
+import queue
+from functools import lru_cache
 from dotenv import load_dotenv
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
+from logging.handlers import QueueHandler, QueueListener
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -17,10 +21,12 @@ def load_environment() -> bool:
     env_path = os.path.join(os.path.dirname(__file__), '..', '.env')
     if os.path.exists(env_path):
         load_dotenv(env_path)
+        _reset_env_cache()
         logger.info("Loaded environment variables from .env file")
         return True
     return False
 
+@lru_cache(maxsize=1)
 def get_openai_api_key() -> Optional[str]:
     """Get the OpenAI API key from environment variables.
     
@@ -29,6 +35,7 @@ def get_openai_api_key() -> Optional[str]:
     """
     return os.getenv('OPENAI_API_KEY')
 
+@lru_cache(maxsize=1)
 def is_openai_enabled() -> bool:
     """Check if OpenAI features are enabled.
     
@@ -37,6 +44,7 @@ def is_openai_enabled() -> bool:
     """
     return os.getenv('USE_OPENAI', 'False').lower() in ('true', '1', 't')
 
+@lru_cache(maxsize=1)
 def get_log_level() -> int:
     """Get the logging level from environment variables.
     
@@ -53,6 +61,16 @@ def get_log_level() -> int:
     }
     return levels.get(level_str, logging.INFO)
 
+def _reset_env_cache() -> None:
+    """Clear the cached environment lookups so the next call re-reads os.environ.
+    
+    The getters above are cached because they sit on hot paths; call this
+    after changing the relevant environment variables (e.g. in tests).
+    """
+    get_openai_api_key.cache_clear()
+    is_openai_enabled.cache_clear()
+    get_log_level.cache_clear()
+
 def validate_config(config: Dict[str, Any]) -> bool:
     """Validate the configuration dictionary.
     
@@ -81,19 +99,34 @@ def validate_config(config: Dict[str, Any]) -> bool:
 def setup_logging(log_level: Optional[int] = None) -> None:
     """Set up logging configuration.
     
+    Logs go to the console. File logging is opt-in through the
+    ``HFS_LOG_FILE`` environment variable; when set, records are handed to a
+    background QueueListener so the logging call itself never blocks on disk.
+    
     Args:
         log_level: Logging level (default: from environment or INFO)
     """
     if log_level is None:
         log_level = get_log_level()
     
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    
+    # basicConfig is a no-op once the root logger has handlers, so only open the
+    # log file and start its listener when they will actually be installed
+    log_file = os.getenv('HFS_LOG_FILE')
+    if log_file and not logging.getLogger().handlers:
+        # QueueHandler formats the record, so the file handler writes it as-is
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        listener = QueueListener(log_queue, logging.FileHandler(log_file))
+        listener.start()
+        atexit.register(listener.stop)
+        handlers.append(QueueHandler(log_queue))
+    
+    # The root level makes disabled logger.debug calls return before formatting
     logging.basicConfig(
         level=log_level,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler('hedgefund_simulator.log')
-        ]
+        handlers=handlers
     )
     
     # Set log level for external libraries
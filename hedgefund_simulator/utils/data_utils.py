@@ -1,8 +1,105 @@
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Optional, Union
 import yfinance as yf
 
+from ._njit import _float_sigs, njit, prange
+
+logger = logging.getLogger(__name__)
+
+class BarPanel:
+    """Struct-of-arrays view of an OHLCV DataFrame for positional per-bar access.
+    
+    Each column is converted once to a contiguous ndarray so a simulation loop
+    can read ``panel.close[i]`` instead of doing a label lookup on every bar.
+    """
+    
+    def __init__(self, df: pd.DataFrame):
+        """Build the panel from a DataFrame.
+        
+        Args:
+            df: DataFrame with 'Open', 'High', 'Low', 'Close', 'Volume' columns
+                and any number of indicator columns
+        """
+        self.index = df.index
+        self.columns: Dict[str, np.ndarray] = {}
+        names = df.columns.get_level_values(0) if isinstance(df.columns, pd.MultiIndex) else df.columns
+        for name in dict.fromkeys(names):
+            col = df[name]
+            if isinstance(col, pd.DataFrame):
+                col = col.iloc[:, 0]  # yfinance may return (field, ticker) columns
+            self.columns[name] = np.ascontiguousarray(col.to_numpy())
+        
+        self.open = self.columns.get('Open')
+        self.high = self.columns.get('High')
+        self.low = self.columns.get('Low')
+        self.close = self.columns.get('Close')
+        self.volume = self.columns.get('Volume')
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+@njit(_float_sigs('{t}[:]({ro})'), cache=True)
+def _nan_like(x: np.ndarray) -> np.ndarray:
+    """NaN-filled output array with the same dtype as the input series."""
+    out = np.empty_like(x)
+    out[:] = np.nan
+    return out
+
+@njit(_float_sigs('{t}[:]({ro}, {ro}, {ro}, int64)'), cache=True)
+def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int) -> np.ndarray:
+    """True Range and its rolling mean fused into a single pass.
+    
+    As in pandas, the true range is the largest of its non-missing parts and
+    a window containing a missing true range yields NaN.
+    """
+    n = close.shape[0]
+    out = _nan_like(close)
+    ring = np.zeros(window)
+    running_sum = 0.0
+    nan_count = 0
+    
+    for i in range(n):
+        tr = high[i] - low[i]
+        if i > 0:
+            up = abs(high[i] - close[i - 1])
+            down = abs(low[i] - close[i - 1])
+            if np.isnan(tr) or up > tr:
+                tr = up
+            if np.isnan(tr) or down > tr:
+                tr = down
+        
+        # Replace the value leaving the window in the ring buffer
+        slot = i % window
+        if i >= window:
+            old = ring[slot]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                running_sum -= old
+        ring[slot] = tr
+        if np.isnan(tr):
+            nan_count += 1
+        else:
+            running_sum += tr
+        
+        if i >= window - 1 and nan_count == 0:
+            out[i] = running_sum / window
+    
+    return out
+
 def calculate_atr(data: pd.DataFrame, window: int = 14) -> pd.Series:
     """Calculate the Average True Range (ATR) indicator.
     
@@ -13,19 +110,50 @@ def calculate_atr(data: pd.DataFrame, window: int = 14) -> pd.Series:
     Returns:
         Series containing ATR values
     """
-    high = data['High']
-    low = data['Low']
-    close = data['Close']
+    high = data['High'].to_numpy(dtype=np.float64)
+    low = data['Low'].to_numpy(dtype=np.float64)
+    close = data['Close'].to_numpy(dtype=np.float64)
     
-    # Calculate True Range
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
+    return pd.Series(_atr(high, low, close, window), index=data.index)
+
+@njit(_float_sigs('UniTuple({t}[:], 3)({ro}, int64, float64)'), cache=True)
+def _bbands(close: np.ndarray, window: int, num_std: float):
+    """Rolling mean and sample std from running sums, returned as (upper, middle, lower).
     
-    true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    atr = true_range.rolling(window=window).mean()
+    A window containing a missing close yields NaN, as in pandas.
+    """
+    n = close.shape[0]
+    upper = _nan_like(close)
+    middle = _nan_like(close)
+    lower = _nan_like(close)
+    s = 0.0
+    s2 = 0.0
+    nan_count = 0
     
-    return atr
+    for i in range(n):
+        x = float(close[i])
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            s += x
+            s2 += x * x
+        if i >= window:
+            old = float(close[i - window])
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                s -= old
+                s2 -= old * old
+        
+        if i >= window - 1 and nan_count == 0:
+            mean = s / window
+            var = max((s2 - s * mean) / (window - 1), 0.0)
+            std = np.sqrt(var)
+            middle[i] = mean
+            upper[i] = mean + num_std * std
+            lower[i] = mean - num_std * std
+    
+    return upper, middle, lower
 
 def calculate_bollinger_bands(data: pd.DataFrame, window: int = 20, num_std: float = 2.0) -> pd.DataFrame:
     """Calculate Bollinger Bands.
@@ -38,17 +166,50 @@ def calculate_bollinger_bands(data: pd.DataFrame, window: int = 20, num_std: flo
     Returns:
         DataFrame with 'upper', 'middle', 'lower' band columns
     """
-    df = data.copy()
-    df['middle'] = df['Close'].rolling(window=window).mean()
-    df['std'] = df['Close'].rolling(window=window).std()
+    close = data['Close'].to_numpy(dtype=np.float64)
+    upper, middle, lower = _bbands(close, window, float(num_std))
+    
+    return pd.DataFrame({'upper': upper, 'middle': middle, 'lower': lower}, index=data.index)
+
+@njit(_float_sigs('{t}[:]({ro}, int64)'), cache=True)
+def _rsi_wilder(close: np.ndarray, period: int) -> np.ndarray:
+    """Wilder-smoothed RSI over a close array (NaN until warmed up).
+    
+    Changes involving a missing close are skipped: the averages are held
+    and the previous RSI is repeated, so a gap doesn't poison the rest of
+    the series.
+    """
+    n = close.shape[0]
+    out = _nan_like(close)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    n_valid = 0
     
-    df['upper'] = df['middle'] + (df['std'] * num_std)
-    df['lower'] = df['middle'] - (df['std'] * num_std)
+    for i in range(1, n):
+        d = float(close[i] - close[i - 1])
+        if not np.isnan(d):
+            gain = d if d > 0 else 0.0
+            loss = -d if d < 0 else 0.0
+            n_valid += 1
+            if n_valid <= period:
+                # Seed the averages with the simple mean of the first `period` changes
+                avg_gain += gain
+                avg_loss += loss
+                if n_valid == period:
+                    avg_gain /= period
+                    avg_loss /= period
+            else:
+                # Wilder's smoothing for the remainder of the series
+                avg_gain = (avg_gain * (period - 1) + gain) / period
+                avg_loss = (avg_loss * (period - 1) + loss) / period
+        
+        if n_valid >= period:
+            out[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
     
-    return df[['upper', 'middle', 'lower']]
+    return out
 
 def calculate_rsi(data: pd.DataFrame, window: int = 14) -> pd.Series:
-    """Calculate the Relative Strength Index (RSI).
+    """Calculate the Relative Strength Index (RSI) using Wilder's smoothing.
     
     Args:
         data: DataFrame with 'Close' column
@@ -57,14 +218,46 @@ def calculate_rsi(data: pd.DataFrame, window: int = 14) -> pd.Series:
     Returns:
         Series containing RSI values
     """
-    delta = data['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    close = data['Close'].to_numpy(dtype=np.float64)
+    return pd.Series(_rsi_wilder(close, window), index=data.index)
+
+@njit(_float_sigs('UniTuple({t}[:], 3)({ro}, int64, int64, int64)'), cache=True)
+def _macd(close: np.ndarray, fast: int, slow: int, signal: int):
+    """Fast/slow/signal EMAs (adjust=False) fused into one pass; returns (macd, signal, histogram).
+    
+    The EMAs start at the first valid close and hold their previous value on
+    a missing close, like ``ewm(adjust=False, ignore_na=True)``.
+    """
+    n = close.shape[0]
+    macd_out = np.empty_like(close)
+    sig_out = np.empty_like(close)
+    hist_out = np.empty_like(close)
     
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
+    alpha_f = 2.0 / (fast + 1)
+    alpha_s = 2.0 / (slow + 1)
+    alpha_sig = 2.0 / (signal + 1)
     
-    return rsi
+    ef = np.nan
+    es = np.nan
+    sig = np.nan
+    for i in range(n):
+        x = float(close[i])
+        if np.isnan(ef):
+            ef = x
+            es = x
+        elif not np.isnan(x):
+            ef += alpha_f * (x - ef)
+            es += alpha_s * (x - es)
+        m = ef - es
+        if np.isnan(sig):
+            sig = m
+        else:
+            sig += alpha_sig * (m - sig)
+        macd_out[i] = m
+        sig_out[i] = sig
+        hist_out[i] = m - sig
+    
+    return macd_out, sig_out, hist_out
 
 def calculate_macd(
     data: pd.DataFrame, 
@@ -83,18 +276,30 @@ def calculate_macd(
     Returns:
         DataFrame with 'macd', 'signal', 'histogram' columns
     """
-    df = data.copy()
-    
-    # Calculate EMAs
-    fast_ema = df['Close'].ewm(span=fast_window, adjust=False).mean()
-    slow_ema = df['Close'].ewm(span=slow_window, adjust=False).mean()
+    close = data['Close'].to_numpy(dtype=np.float64)
+    macd, signal, histogram = _macd(close, fast_window, slow_window, signal_window)
     
-    # Calculate MACD and signal line
-    df['macd'] = fast_ema - slow_ema
-    df['signal'] = df['macd'].ewm(span=signal_window, adjust=False).mean()
-    df['histogram'] = df['macd'] - df['signal']
-    
-    return df[['macd', 'signal', 'histogram']]
+    return pd.DataFrame({'macd': macd, 'signal': signal, 'histogram': histogram}, index=data.index)
+
+@njit([
+    'int64[:](Array(float64, 1, "A", readonly=True), Array(int64, 1, "A", readonly=True))',
+    'float64[:](Array(float64, 1, "A", readonly=True), Array(float64, 1, "A", readonly=True))',
+], cache=True)
+def _obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Running On-Balance Volume; accumulates in the volume array's dtype."""
+    out = np.zeros_like(volume)
+    acc = out[0] if out.shape[0] > 0 else 0
+    for i in range(1, close.shape[0]):
+        c = close[i] - close[i - 1]
+        v = volume[i]
+        # A missing volume (v != v) adds nothing, like fillna(0) on the signed volume
+        if v == v:
+            if c > 0:
+                acc += v
+            elif c < 0:
+                acc -= v
+        out[i] = acc
+    return out
 
 def calculate_obv(data: pd.DataFrame) -> pd.Series:
     """Calculate On-Balance Volume (OBV).
@@ -105,70 +310,282 @@ def calculate_obv(data: pd.DataFrame) -> pd.Series:
     Returns:
         Series containing OBV values
     """
-    obv = (np.sign(data['Close'].diff()) * data['Volume']).fillna(0).cumsum()
-    return obv
+    close = data['Close'].to_numpy(dtype=np.float64)
+    volume = data['Volume'].to_numpy()
+    # Volume is integral for equities, so keep integer arithmetic when we can
+    volume = volume.astype(np.int64 if np.issubdtype(volume.dtype, np.integer) else np.float64, copy=False)
+    
+    return pd.Series(_obv(close, volume), index=data.index)
+
+@njit(_float_sigs('{t}[:]({ro}, int64)'), cache=True)
+def _sma(close: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean via the cumulative-sum difference (NaN for the first window-1 bars).
+    
+    Missing values are counted in a second prefix sum; a window containing
+    one yields NaN, as in pandas.
+    """
+    n = close.shape[0]
+    out = _nan_like(close)
+    # Prefix sums are kept in float64 even for float32 input to limit drift
+    c = np.empty(n + 1)
+    nans = np.empty(n + 1, dtype=np.int64)
+    c[0] = 0.0
+    nans[0] = 0
+    for i in range(n):
+        if np.isnan(close[i]):
+            c[i + 1] = c[i]
+            nans[i + 1] = nans[i] + 1
+        else:
+            c[i + 1] = c[i] + close[i]
+            nans[i + 1] = nans[i]
+    for i in range(window, n + 1):
+        if nans[i] == nans[i - window]:
+            out[i - 1] = (c[i] - c[i - window]) / window
+    return out
+
+def sma(data: pd.Series, window: int = 20) -> pd.Series:
+    """Calculate a Simple Moving Average.
+    
+    Args:
+        data: Series of values (typically closing prices)
+        window: Lookback period for the moving average
+        
+    Returns:
+        Series containing SMA values
+    """
+    arr = data.to_numpy(dtype=np.float64)
+    return pd.Series(_sma(arr, window), index=data.index)
+
+@njit(_float_sigs('{t}[:]({ro}, int64)'), cache=True)
+def _ema(close: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average with pandas' adjust=False recursion.
+    
+    Starts at the first valid value and holds over missing ones, like
+    ``ewm(adjust=False, ignore_na=True)``.
+    """
+    n = close.shape[0]
+    out = np.empty_like(close)
+    alpha = 2.0 / (span + 1)
+    e = np.nan
+    for i in range(n):
+        x = float(close[i])
+        if np.isnan(e):
+            e = x
+        elif not np.isnan(x):
+            e += alpha * (x - e)
+        out[i] = e
+    return out
+
+@njit(_float_sigs('{t}[:]({ro}, int64)'), cache=True)
+def _rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sample std; a window containing any NaN yields NaN, as in pandas."""
+    n = x.shape[0]
+    out = _nan_like(x)
+    s = 0.0
+    s2 = 0.0
+    nan_count = 0
+    for i in range(n):
+        v = float(x[i])
+        if np.isnan(v):
+            nan_count += 1
+        else:
+            s += v
+            s2 += v * v
+        if i >= window:
+            old = float(x[i - window])
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                s -= old
+                s2 -= old * old
+        if i >= window - 1 and nan_count == 0:
+            mean = s / window
+            out[i] = np.sqrt(max((s2 - s * mean) / (window - 1), 0.0))
+    return out
+
+@njit(_float_sigs('{t}[:]({ro})'), cache=True)
+def _pct_change(close: np.ndarray) -> np.ndarray:
+    """Simple period-over-period returns with a leading NaN."""
+    n = close.shape[0]
+    out = np.empty_like(close)
+    if n == 0:
+        return out
+    out[0] = np.nan
+    for i in range(1, n):
+        out[i] = close[i] / close[i - 1] - 1.0
+    return out
+
+# Row layout of the buffer filled by _all_indicators
+_INDICATOR_ROWS = (
+    'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'RSI',
+    'macd', 'signal', 'histogram',
+    'upper', 'middle', 'lower',
+    'ATR', 'Returns', 'Volatility',
+)
+
+# Column order of the indicators appended by add_technical_indicators
+_INDICATOR_COLUMNS = (
+    'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'RSI',
+    'macd', 'signal', 'histogram',
+    'upper', 'middle', 'lower',
+    'ATR', 'OBV', 'Returns', 'Volatility',
+)
+
+# Number of independent indicator groups dispatched by _indicator_task
+_N_INDICATOR_TASKS = 9
+
+@njit(_float_sigs('void(int64, {ro}, {ro}, {ro}, {t}[:, :])'), cache=True)
+def _indicator_task(task: int, high: np.ndarray, low: np.ndarray, close: np.ndarray, out: np.ndarray) -> None:
+    """Compute one independent indicator group into its rows of `out`."""
+    if task == 0:
+        out[0] = _sma(close, 20)
+    elif task == 1:
+        out[1] = _sma(close, 50)
+    elif task == 2:
+        out[2] = _ema(close, 12)
+    elif task == 3:
+        out[3] = _ema(close, 26)
+    elif task == 4:
+        out[4] = _rsi_wilder(close, 14)
+    elif task == 5:
+        macd, signal, histogram = _macd(close, 12, 26, 9)
+        out[5] = macd
+        out[6] = signal
+        out[7] = histogram
+    elif task == 6:
+        upper, middle, lower = _bbands(close, 20, 2.0)
+        out[8] = upper
+        out[9] = middle
+        out[10] = lower
+    elif task == 7:
+        out[11] = _atr(high, low, close, 14)
+    else:
+        returns = _pct_change(close)
+        out[12] = returns
+        out[13] = _rolling_std(returns, 20) * np.sqrt(252.0)  # Annualized
+
+@njit(_float_sigs('void({ro}, {ro}, {ro}, {t}[:, :])'), parallel=True, cache=True)
+def _all_indicators(high: np.ndarray, low: np.ndarray, close: np.ndarray, out: np.ndarray) -> None:
+    """Fill `out` (one row per _INDICATOR_ROWS entry) running independent indicators in parallel."""
+    for task in prange(_N_INDICATOR_TASKS):
+        _indicator_task(task, high, low, close, out)
+
+@njit(_float_sigs('void({ro2}, {ro2}, {ro2}, {t}[:, :, :])'), parallel=True, cache=True)
+def _batch_indicators(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, out: np.ndarray) -> None:
+    """Fill `out[t]` for every ticker row `t`, parallel over (ticker, indicator group) pairs."""
+    for k in prange(closes.shape[0] * _N_INDICATOR_TASKS):
+        t = k // _N_INDICATOR_TASKS
+        _indicator_task(k - t * _N_INDICATOR_TASKS, highs[t], lows[t], closes[t], out[t])
 
 def add_technical_indicators(data: pd.DataFrame) -> pd.DataFrame:
     """Add common technical indicators to the DataFrame.
     
+    Indicator columns are computed and stored as float32, which is ample
+    precision for signal generation and halves their memory footprint;
+    kernels accumulate running sums in float64. The OHLCV columns and OBV
+    keep their original dtypes.
+    
     Args:
         data: DataFrame with OHLCV data
         
     Returns:
         DataFrame with added technical indicators
     """
-    df = data.copy()
+    high = data['High'].to_numpy(dtype=np.float32)
+    low = data['Low'].to_numpy(dtype=np.float32)
+    close = data['Close'].to_numpy(dtype=np.float32)
     
-    # Moving Averages
-    df['SMA_20'] = df['Close'].rolling(window=20).mean()
-    df['SMA_50'] = df['Close'].rolling(window=50).mean()
-    df['EMA_12'] = df['Close'].ewm(span=12, adjust=False).mean()
-    df['EMA_26'] = df['Close'].ewm(span=26, adjust=False).mean()
+    # Independent indicators are computed in one parallel kernel call
+    out = np.empty((len(_INDICATOR_ROWS), close.shape[0]), dtype=np.float32)
+    _all_indicators(high, low, close, out)
     
-    # RSI
-    df['RSI'] = calculate_rsi(df)
+    cols = dict(zip(_INDICATOR_ROWS, out))
     
-    # MACD
-    macd = calculate_macd(df)
-    df = pd.concat([df, macd], axis=1)
+    # OBV keeps integer volume arithmetic, so it runs outside the float buffer
+    cols['OBV'] = calculate_obv(data).to_numpy()
     
-    # Bollinger Bands
-    bb = calculate_bollinger_bands(df)
-    df = pd.concat([df, bb], axis=1)
+    # assign builds a new frame, so the caller's data is left unmodified
+    return data.assign(**{name: cols[name] for name in _INDICATOR_COLUMNS})
+
+def add_indicators_batch(data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """Add the technical indicators of add_technical_indicators to several tickers at once.
     
-    # ATR
-    df['ATR'] = calculate_atr(df)
+    The High/Low/Close columns of every ticker are stacked into 2-D
+    ``(n_tickers, n_bars)`` float32 arrays and all indicators are computed in
+    a single parallel kernel call. Shorter histories are NaN-padded at the
+    end; the indicators are causal, so the padding never affects real bars.
     
-    # OBV
-    df['OBV'] = calculate_obv(df)
+    Args:
+        data: Dictionary mapping ticker symbols to DataFrames with OHLCV data
+        
+    Returns:
+        Dictionary mapping each ticker to its DataFrame with added technical indicators
+    """
+    if not data:
+        return {}
     
-    # Daily Returns
-    df['Returns'] = df['Close'].pct_change()
+    n_bars = max(len(df) for df in data.values())
+    highs = np.full((len(data), n_bars), np.nan, dtype=np.float32)
+    lows = np.full_like(highs, np.nan)
+    closes = np.full_like(highs, np.nan)
+    for t, df in enumerate(data.values()):
+        n = len(df)
+        highs[t, :n] = df['High'].to_numpy(dtype=np.float32)
+        lows[t, :n] = df['Low'].to_numpy(dtype=np.float32)
+        closes[t, :n] = df['Close'].to_numpy(dtype=np.float32)
     
-    # Volatility (20-day rolling std of returns)
-    df['Volatility'] = df['Returns'].rolling(window=20).std() * np.sqrt(252)  # Annualized
+    out = np.empty((len(data), len(_INDICATOR_ROWS), n_bars), dtype=np.float32)
+    _batch_indicators(highs, lows, closes, out)
     
-    return df
+    # Slice the shared buffer back into per-ticker frames only at the API boundary
+    result = {}
+    for t, (ticker, df) in enumerate(data.items()):
+        cols = dict(zip(_INDICATOR_ROWS, out[t, :, :len(df)]))
+        cols['OBV'] = calculate_obv(df).to_numpy()
+        result[ticker] = df.assign(**{name: cols[name] for name in _INDICATOR_COLUMNS})
+    
+    return result
+
+def _cache_path(ticker: str, start_date: str, end_date: str, interval: str, add_indicators: bool) -> Path:
+    """Content-addressed location of a cached download."""
+    key = hashlib.sha1(f"{ticker}|{start_date}|{end_date}|{interval}|{add_indicators}".encode()).hexdigest()
+    return Path(os.getenv('HFS_CACHE', '.hfs_cache')) / f"{key}.parquet"
 
 def fetch_yahoo_data(
     ticker: str, 
     start_date: str, 
     end_date: str, 
     interval: str = '1d',
-    add_indicators: bool = True
+    add_indicators: bool = True,
+    use_cache: bool = True,
+    cache_ttl: float = 86400.0
 ) -> pd.DataFrame:
     """Fetch data from Yahoo Finance and add technical indicators.
     
+    Downloads are cached as Parquet files under the directory named by the
+    ``HFS_CACHE`` environment variable (default: ``.hfs_cache``), with the
+    indicator columns included, so repeated calls skip both the network and
+    the indicator computation.
+    
     Args:
         ticker: Stock ticker symbol
         start_date: Start date in 'YYYY-MM-DD' format
         end_date: End date in 'YYYY-MM-DD' format
         interval: Data interval ('1d', '1h', etc.)
         add_indicators: Whether to add technical indicators
+        use_cache: Whether to read from and write to the on-disk cache
+        cache_ttl: Maximum age of a cached file in seconds
         
     Returns:
         DataFrame with market data and indicators
     """
+    cache = _cache_path(ticker, start_date, end_date, interval, add_indicators)
+    if use_cache and cache.exists() and time.time() - cache.stat().st_mtime < cache_ttl:
+        try:
+            return pd.read_parquet(cache)
+        except (ImportError, OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache file {cache}: {str(e)}")
+    
     try:
         data = yf.download(
             ticker,
@@ -183,12 +600,20 @@ def fetch_yahoo_data(
         
         if add_indicators:
             data = add_technical_indicators(data)
-            
-        return data
-        
+    
     except Exception as e:
         print(f"Error fetching data for {ticker}: {str(e)}")
         raise
+    
+    if use_cache:
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            data.to_parquet(cache, compression='zstd')
+        except (ImportError, OSError, ValueError) as e:
+            # A missing Parquet engine or unwritable directory must not fail the fetch
+            logger.warning(f"Could not cache data for {ticker}: {str(e)}")
+    
+    return data
 
 def resample_data(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
     """Resample OHLCV data to a different timeframe.
@@ -201,10 +626,10 @@ def resample_data(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
         Resampled DataFrame
     """
     if not isinstance(data.index, pd.DatetimeIndex):
-        data = data.copy()
-        data.index = pd.to_datetime(data.index)
+        # set_axis returns a new frame without deep-copying the caller's columns
+        data = data.set_axis(pd.to_datetime(data.index), axis=0)
     
-    # Resample OHLCV data
+    # Named aggregations take pandas' built-in groupby paths instead of generic apply
     ohlc_dict = {
         'Open': 'first',
         'High': 'max',
@@ -214,7 +639,8 @@ def resample_data(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
         'Adj Close': 'last'
     }
     
-    resampled = data.resample(timeframe).apply(ohlc_dict)
+    # Only aggregate the columns that are present (e.g. 'Adj Close' is often missing)
+    resampled = data.resample(timeframe).agg({k: v for k, v in ohlc_dict.items() if k in data.columns})
     
     # Drop any rows with missing data
     resampled = resampled.dropna()
@@ -0,0 +1,265 @@
+"""
+Response cache for OpenAI chat completions.
+
+Two tiers sit in front of the API:
+- Exact: SHA-256 of (model, messages) looked up in a SQLite table, so a
+  repeated request is answered from disk in microseconds.
+- Semantic (optional): normalized embeddings of the user message (or of the
+  text the caller names) kept in a NumPy matrix; a request whose embedding has
+  cosine similarity above the threshold with a cached one (same model, system
+  message and caller-supplied scope) reuses its response, which catches
+  paraphrased news headlines.
+
+Cache failures are logged and never fail the underlying request.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+def default_cache_path() -> Path:
+    """Location of the SQLite cache file, next to the market data cache."""
+    return Path(os.getenv('HFS_CACHE', '.hfs_cache')) / 'openai_responses.sqlite3'
+
+def _request_hash(model: str, messages: List[Dict[str, str]]) -> bytes:
+    """Exact-match key of a chat request."""
+    payload = json.dumps({'model': model, 'messages': messages}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).digest()
+
+def _semantic_scope(model: str, messages: List[Dict[str, str]], scope: Optional[str] = None) -> str:
+    """Everything except the embedded text must match for a semantic hit."""
+    fixed = [m for m in messages if m['role'] != 'user']
+    payload = json.dumps({'model': model, 'fixed': fixed, 'scope': scope}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _user_text(messages: List[Dict[str, str]]) -> str:
+    return "\n".join(m['content'] for m in messages if m['role'] == 'user')
+
+class ResponseCache:
+    """Two-tier (exact + semantic) cache of chat completion responses."""
+    
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: float = 3600.0,
+        threshold: float = 0.9,
+        embed: Optional[Callable[[str], List[float]]] = None
+    ):
+        """Initialize the cache.
+        
+        Args:
+            path: SQLite file for the exact tier (default: default_cache_path())
+            ttl: Maximum age of a cached response in seconds; older entries are
+                 evicted, and lookups use it as their default freshness window
+            threshold: Default cosine similarity required for a semantic hit
+            embed: Function mapping text to an embedding vector; the semantic
+                   tier is disabled when None
+        """
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.ttl = ttl
+        self.threshold = threshold
+        self.embed = embed
+        
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        
+        # Semantic tier: unit-norm float32 rows with parallel metadata
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._entries: List[Tuple[str, str, float]] = []  # (scope, response, created_at)
+    
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(hash BLOB PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+        return self._conn
+    
+    def get_exact(self, key: bytes, ttl: float) -> Optional[str]:
+        """Cached response for an exact request hash, if present and fresh."""
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT response FROM responses WHERE hash = ? AND created_at >= ?',
+                (key, time.time() - ttl)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def put_exact(self, key: bytes, response: str) -> None:
+        """Store a response under its exact request hash and evict rows older than self.ttl."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?)', (key, response, now))
+            conn.execute('DELETE FROM responses WHERE created_at < ?', (now - self.ttl,))
+            conn.commit()
+    
+    def _embedding(self, text: str) -> np.ndarray:
+        if self.embed is None:
+            raise RuntimeError("The semantic tier is disabled (no embed function)")
+        vector = np.asarray(self.embed(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+    
+    def get_semantic(self, scope: str, query: np.ndarray, ttl: float, threshold: float) -> Optional[str]:
+        """Most similar fresh cached response in `scope`, if above `threshold`."""
+        with self._lock:
+            if not self._entries:
+                return None
+            scores = self._vectors @ query
+            cutoff = time.time() - ttl
+            for i in np.argsort(scores)[::-1]:
+                if scores[i] < threshold:
+                    break
+                entry_scope, response, created_at = self._entries[i]
+                if entry_scope == scope and created_at >= cutoff:
+                    return response
+        return None
+    
+    def put_semantic(self, scope: str, vector: np.ndarray, response: str) -> None:
+        """Add a response to the semantic tier, dropping entries older than self.ttl."""
+        now = time.time()
+        with self._lock:
+            keep = [i for i, (_, _, created_at) in enumerate(self._entries) if created_at >= now - self.ttl]
+            if len(keep) < len(self._entries):
+                self._vectors = self._vectors[keep]
+                self._entries = [self._entries[i] for i in keep]
+            
+            if self._vectors.size == 0:
+                self._vectors = vector[np.newaxis, :]
+            else:
+                self._vectors = np.vstack([self._vectors, vector])
+            self._entries.append((scope, response, now))
+    
+    def _lookup(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        ttl: float,
+        threshold: float,
+        semantic: bool,
+        semantic_text: Optional[str],
+        scope: Optional[str]
+    ) -> Tuple[Optional[str], bytes, Optional[np.ndarray]]:
+        """Check both tiers; returns (hit, exact key, query embedding or None)."""
+        key = _request_hash(model, messages)
+        query = None
+        try:
+            hit = self.get_exact(key, ttl)
+            if hit is not None:
+                return hit, key, None
+            
+            if semantic and self.embed is not None:
+                query = self._embedding(_user_text(messages) if semantic_text is None else semantic_text)
+                hit = self.get_semantic(_semantic_scope(model, messages, scope), query, ttl, threshold)
+                if hit is not None:
+                    return hit, key, query
+        except Exception as e:
+            logger.warning(f"OpenAI response cache lookup failed: {str(e)}")
+        return None, key, query
+    
+    def _store(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        key: bytes,
+        query: Optional[np.ndarray],
+        response: str,
+        scope: Optional[str]
+    ) -> None:
+        # Eviction follows self.ttl, so a short per-call window never drops entries others still use
+        try:
+            self.put_exact(key, response)
+            if query is not None:
+                self.put_semantic(_semantic_scope(model, messages, scope), query, response)
+        except Exception as e:
+            logger.warning(f"Could not cache OpenAI response: {str(e)}")
+    
+    def cached_or_call(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        call: Callable[[], str],
+        ttl: Optional[float] = None,
+        threshold: Optional[float] = None,
+        semantic: bool = True,
+        semantic_text: Optional[str] = None,
+        scope: Optional[str] = None
+    ) -> str:
+        """Return a cached response for the request, or run `call()` and cache its result.
+        
+        Args:
+            model: Model the request is sent to
+            messages: Chat messages of the request
+            call: Zero-argument function performing the request and returning the response text
+            ttl: Maximum age of a usable cached response (default: self.ttl); entries
+                 are only kept for self.ttl, so a larger value reaches no further back
+            threshold: Cosine similarity required for a semantic hit (default: self.threshold)
+            semantic: Whether the semantic tier may answer this request
+            semantic_text: Text embedded for the semantic tier (default: the user
+                           messages); pass only the variable part of a templated prompt
+            scope: Anything besides `semantic_text` that a semantic hit must share,
+                   such as the template and its other variables
+        
+        Returns:
+            The response text
+        """
+        ttl = self.ttl if ttl is None else ttl
+        threshold = self.threshold if threshold is None else threshold
+        
+        hit, key, query = self._lookup(model, messages, ttl, threshold, semantic, semantic_text, scope)
+        if hit is not None:
+            return hit
+        
+        response = call()
+        self._store(model, messages, key, query, response, scope)
+        return response
+    
+    async def cached_or_call_async(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        call: Callable[[], Awaitable[str]],
+        ttl: Optional[float] = None,
+        threshold: Optional[float] = None,
+        semantic: bool = True,
+        semantic_text: Optional[str] = None,
+        scope: Optional[str] = None
+    ) -> str:
+        """Asynchronous version of cached_or_call; cache I/O runs in a worker thread."""
+        ttl = self.ttl if ttl is None else ttl
+        threshold = self.threshold if threshold is None else threshold
+        
+        # run_in_executor rather than asyncio.to_thread, which needs Python 3.9
+        loop = asyncio.get_running_loop()
+        hit, key, query = await loop.run_in_executor(
+            None, functools.partial(self._lookup, model, messages, ttl, threshold, semantic, semantic_text, scope)
+        )
+        if hit is not None:
+            return hit
+        
+        response = await call()
+        await loop.run_in_executor(None, functools.partial(self._store, model, messages, key, query, response, scope))
+        return response
+    
+    def clear(self) -> None:
+        """Remove every cached response from both tiers."""
+        with self._lock:
+            self._connection().execute('DELETE FROM responses')
+            self._connection().commit()
+            self._vectors = np.empty((0, 0), dtype=np.float32)
+            self._entries = []
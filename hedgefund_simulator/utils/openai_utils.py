@@ -9,33 +9,135 @@ This module provides functions to interact with OpenAI's API for:
 
 import os
 import json
-from typing import Dict, List, Optional, Union, Any
+import time
+import atexit
+import asyncio
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union, Any
 import logging
 from datetime import datetime
 
 # Import OpenAI (will be handled gracefully if not available)
 try:
     import openai
-    from openai import OpenAI
+    import httpx
+    from openai import (
+        OpenAI, AsyncOpenAI,
+        APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+    )
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     logging.warning("OpenAI package not available. Some features will be disabled.")
 
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from tenacity import RetryCallState, retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
 from .config_utils import get_openai_api_key, is_openai_enabled
+from .openai_cache import ResponseCache
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = None
-if OPENAI_AVAILABLE and is_openai_enabled():
+# Connection pool sized for concurrent fan-out; idle connections are kept warm for reuse
+_HTTP_LIMITS: Dict[str, Any] = {'max_connections': 64, 'max_keepalive_connections': 32, 'keepalive_expiry': 30.0}
+_HTTP_TIMEOUT: Dict[str, Any] = {'timeout': 60.0, 'connect': 5.0}
+
+def _build_http_client() -> "httpx.Client":
+    """Pooled (HTTP/2 when available) transport for the synchronous OpenAI client."""
+    http_client = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(**_HTTP_LIMITS),
+        timeout=httpx.Timeout(**_HTTP_TIMEOUT)
+    )
+    atexit.register(http_client.close)
+    return http_client
+
+def _build_async_http_client() -> "httpx.AsyncClient":
+    """Pooled (HTTP/2 when available) transport for the asynchronous OpenAI client."""
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(**_HTTP_LIMITS),
+        timeout=httpx.Timeout(**_HTTP_TIMEOUT)
+    )
+
+# lru_cache may run the factory twice when two threads miss at once; the lock
+# guarantees a single client (and connection pool) per API key
+_client_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _create_client(api_key: str) -> "OpenAI":
+    return OpenAI(api_key=api_key, http_client=_build_http_client())
+
+def _create_async_client(api_key: str) -> "AsyncOpenAI":
+    return AsyncOpenAI(api_key=api_key, http_client=_build_async_http_client())
+
+# An httpx.AsyncClient is bound to the event loop it first ran on, so every loop
+# (e.g. each asyncio.run) gets its own async client, keyed with its API key
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[str, AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _configured_api_key() -> Optional[str]:
+    """API key to build clients with, or None when OpenAI features can't be used."""
+    if not (OPENAI_AVAILABLE and is_openai_enabled()):
+        return None
     api_key = get_openai_api_key()
-    if api_key:
-        client = OpenAI(api_key=api_key)
-    else:
+    if not api_key:
         logger.warning("OpenAI API key not found. OpenAI features will be disabled.")
-        OPENAI_AVAILABLE = False
+        return None
+    return api_key
+
+def get_client() -> Optional["OpenAI"]:
+    """Return the shared synchronous OpenAI client, creating it on first use.
+    
+    The configuration is read on every call, so loading it after this module
+    was imported still enables OpenAI; the client itself is built once per
+    API key and reused.
+    
+    Returns:
+        The OpenAI client, or None if OpenAI features are unavailable, disabled
+        or no API key is configured
+    """
+    api_key = _configured_api_key()
+    if not api_key:
+        return None
+    with _client_lock:
+        return _create_client(api_key)
+
+def get_async_client() -> Optional["AsyncOpenAI"]:
+    """Return the AsyncOpenAI client of the running event loop, creating it on first use.
+    
+    Must be called from a coroutine. Requests on one event loop share a client
+    and its connection pool; a new loop gets a new client.
+    
+    Returns:
+        The AsyncOpenAI client, or None under the same conditions as get_client()
+    """
+    api_key = _configured_api_key()
+    if not api_key:
+        return None
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        # A client's open connections can keep its loop alive, so drop closed loops explicitly
+        for closed in [other for other in _async_clients if other.is_closed()]:
+            del _async_clients[closed]
+        
+        entry = _async_clients.get(loop)
+        if entry is None or entry[0] != api_key:
+            entry = (api_key, _create_async_client(api_key))
+            _async_clients[loop] = entry
+        return entry[1]
 
 class OpenAIFeatureDisabledError(Exception):
     """Exception raised when trying to use OpenAI features that are disabled."""
@@ -47,25 +149,298 @@ def check_openai_available() -> bool:
     Returns:
         bool: True if OpenAI features are available and enabled
     """
-    if not OPENAI_AVAILABLE:
-        return False
-    if not is_openai_enabled():
-        return False
+    return get_client() is not None
+
+class _RateLimitedDispatcher:
+    """Throttle for concurrent OpenAI requests.
+    
+    Two leaky buckets, one for requests and one for tokens per minute, refill
+    continuously on a monotonic clock. Each request waits until both buckets
+    hold enough capacity, so a large fan-out runs at the account's limits
+    instead of tripping 429s. A 429 pauses every request for its Retry-After.
+    """
+    
+    def __init__(self, max_requests_per_minute: float = 3500, max_tokens_per_minute: float = 90000):
+        self.max_requests_per_minute = float(max_requests_per_minute)
+        self.max_tokens_per_minute = float(max_tokens_per_minute)
+        self._available_requests = self.max_requests_per_minute
+        self._available_tokens = self.max_tokens_per_minute
+        self._last_update = time.monotonic()
+        self._paused_until = 0.0
+    
+    def configure(
+        self,
+        max_requests_per_minute: Optional[float] = None,
+        max_tokens_per_minute: Optional[float] = None
+    ) -> None:
+        """Update the limits; None leaves a limit unchanged."""
+        if max_requests_per_minute is not None:
+            self.max_requests_per_minute = float(max_requests_per_minute)
+        if max_tokens_per_minute is not None:
+            self.max_tokens_per_minute = float(max_tokens_per_minute)
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+        self._available_requests = min(
+            self.max_requests_per_minute,
+            self._available_requests + self.max_requests_per_minute * elapsed / 60.0
+        )
+        self._available_tokens = min(
+            self.max_tokens_per_minute,
+            self._available_tokens + self.max_tokens_per_minute * elapsed / 60.0
+        )
+    
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for `seconds`, e.g. after a 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wait until one request and `estimated_tokens` tokens of capacity are free."""
+        # A request larger than the whole bucket would otherwise wait forever
+        tokens = min(float(estimated_tokens), self.max_tokens_per_minute)
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            
+            # No await between the check and the update, so this is atomic on the event loop
+            self._refill()
+            if self._available_requests >= 1 and self._available_tokens >= tokens:
+                self._available_requests -= 1
+                self._available_tokens -= tokens
+                return
+            
+            await asyncio.sleep(max(
+                (1 - self._available_requests) * 60.0 / self.max_requests_per_minute,
+                (tokens - self._available_tokens) * 60.0 / self.max_tokens_per_minute,
+                0.001
+            ))
+    
+    async def submit(self, make_request: Callable[[], Awaitable[Any]], tokens: int) -> Any:
+        """Run `make_request()` once capacity for it is available.
+        
+        Args:
+            make_request: Zero-argument callable returning the request coroutine
+            tokens: Estimated prompt plus completion tokens of the request
+            
+        Returns:
+            The result of the request
+        """
+        await self.acquire(tokens)
+        try:
+            return await make_request()
+        except Exception as e:
+            if getattr(e, 'status_code', None) == 429:
+                retry_after = _retry_after(e)
+                if retry_after is None:
+                    retry_after = 1.0
+                logger.warning(f"OpenAI rate limit hit, pausing requests for {retry_after:.1f}s")
+                self.pause(retry_after)
+            raise
+
+def _retry_after(error: Optional[BaseException]) -> Optional[float]:
+    """Seconds to wait according to the Retry-After headers of an API error, if given."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms') is not None:
+            return float(headers['retry-after-ms']) / 1000.0
+        if headers.get('retry-after') is not None:
+            return float(headers['retry-after'])
+    except ValueError:
+        pass
+    return None
+
+def _estimate_tokens(messages: List[Dict[str, str]], max_completion_tokens: int) -> int:
+    """Rough token estimate of a request (about 4 characters per token)."""
+    return sum(len(m['content']) for m in messages) // 4 + max_completion_tokens
+
+def _is_transient(error: BaseException) -> bool:
+    """Whether an API error is worth retrying (rate limits, timeouts, 5xx)."""
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+_backoff = wait_random_exponential(min=1, max=30)
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Honor the server's Retry-After when given, else back off with jitter."""
+    retry_after = _retry_after(retry_state.outcome.exception() if retry_state.outcome else None)
+    return retry_after if retry_after is not None else _backoff(retry_state)
+
+# Up to 3 attempts on transient errors; other errors are raised immediately
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=_retry_wait,
+    retry=retry_if_exception(_is_transient),
+    reraise=True
+)
+
+@_retry_transient
+def _chat_create(**kwargs: Any) -> Any:
+    """client.chat.completions.create with retries on transient errors."""
+    client = get_client()
     if client is None:
-        return False
-    return True
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    return client.chat.completions.create(**kwargs)
+
+@_retry_transient
+async def _chat_create_async(tokens: int, **kwargs: Any) -> Any:
+    """Async chat completion, throttled by the dispatcher on every attempt and retried on transient errors."""
+    async_client = get_async_client()
+    if async_client is None:
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    return await _dispatcher.submit(lambda: async_client.chat.completions.create(**kwargs), tokens=tokens)
+
+# Completion budget assumed for requests that do not set max_tokens
+_DEFAULT_COMPLETION_TOKENS = 500
+
+# Shared by every *_async call so concurrent batches respect one set of limits
+_dispatcher = _RateLimitedDispatcher()
+
+def configure_rate_limits(
+    max_requests_per_minute: Optional[float] = None,
+    max_tokens_per_minute: Optional[float] = None
+) -> None:
+    """Set the request and token rate limits used by the async OpenAI calls.
+    
+    Args:
+        max_requests_per_minute: Maximum requests per minute (None to keep the current value)
+        max_tokens_per_minute: Maximum tokens per minute (None to keep the current value)
+    """
+    _dispatcher.configure(max_requests_per_minute, max_tokens_per_minute)
+
+async def probe_rate_limits(model: str = "gpt-3.5-turbo") -> Dict[str, Optional[int]]:
+    """Read the account's rate limits for `model` with a 1-token request and apply them.
+    
+    Args:
+        model: The OpenAI model whose limits should be probed
+        
+    Returns:
+        Dictionary with 'max_requests_per_minute' and 'max_tokens_per_minute'
+        (None where the API did not report a limit)
+        
+    Raises:
+        OpenAIFeatureDisabledError: If OpenAI features are not available
+    """
+    async_client = get_async_client()
+    if async_client is None:
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    
+    raw = await async_client.chat.completions.with_raw_response.create(
+        model=model,
+        messages=[{"role": "user", "content": "ping"}],
+        max_tokens=1
+    )
+    
+    rpm = raw.headers.get('x-ratelimit-limit-requests')
+    tpm = raw.headers.get('x-ratelimit-limit-tokens')
+    limits = {
+        'max_requests_per_minute': int(rpm) if rpm else None,
+        'max_tokens_per_minute': int(tpm) if tpm else None
+    }
+    configure_rate_limits(**limits)
+    return limits
+
+# Model used to embed prompts for the semantic response cache
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+_response_cache: Optional[ResponseCache] = None
+
+def _embed(text: str) -> List[float]:
+    """Embedding of `text` for semantic cache lookups."""
+    client = get_client()
+    if client is None:
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    return client.embeddings.create(model=EMBEDDING_MODEL, input=text).data[0].embedding
+
+def get_response_cache() -> ResponseCache:
+    """Return the shared response cache, creating it on first use.
+    
+    Returns:
+        The ResponseCache used by analyze_sentiment and explain_trade
+    """
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(embed=_embed)
+    return _response_cache
+
+sentiment_system_prompt = "You are a financial analyst specializing in sentiment analysis of market news."
+
+# Sentiment prompt with and without the ticker focus line, formatted once at
+# import so a request only fills in the text (and ticker)
+_SENTIMENT_TEMPLATE = """Analyze the sentiment of the following financial text. 
+        {focus}
+        Consider both the tone (positive/negative/neutral) and the confidence level.
+        Also identify any key themes or events mentioned that could affect the market.
+        
+        Text: {{text}}
+        
+        Respond with a JSON object containing:
+        - sentiment: 'positive', 'negative', or 'neutral'
+        - confidence: float between 0 and 1
+        - themes: array of key themes or events mentioned
+        - summary: a brief summary of the sentiment and key points
+        """
+
+_SENTIMENT_WITH_TICKER = _SENTIMENT_TEMPLATE.format(focus='Focus on the impact on {ticker} stock. ')
+_SENTIMENT_NO_TICKER = _SENTIMENT_TEMPLATE.format(focus='')
+
+def _sentiment_messages(text: str, ticker: Optional[str] = None) -> List[Dict[str, str]]:
+    """Build the chat messages for a sentiment analysis request."""
+    template = _SENTIMENT_WITH_TICKER if ticker else _SENTIMENT_NO_TICKER
+    return [
+        {"role": "system", "content": sentiment_system_prompt},
+        {"role": "user", "content": template.format(text=text, ticker=ticker)}
+    ]
+
+def _sentiment_scope(ticker: Optional[str] = None) -> str:
+    """Semantic cache scope of a sentiment request: the template variant and ticker."""
+    return json.dumps({'template': 'ticker' if ticker else 'no_ticker', 'ticker': ticker or None})
+
+def _sentiment_result(content: str, model: str) -> Dict[str, Any]:
+    """Parse a sentiment analysis response into the result dictionary."""
+    return _sentiment_record(json.loads(content), model)
+
+def _sentiment_record(result: Dict[str, Any], model: str) -> Dict[str, Any]:
+    """Normalize one parsed sentiment object into the result dictionary."""
+    return {
+        'success': True,
+        'sentiment': result.get('sentiment', 'neutral'),
+        'confidence': float(result.get('confidence', 0.5)),
+        'themes': result.get('themes', []),
+        'summary': result.get('summary', ''),
+        'model': model,
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+def _error_result(error: BaseException) -> Dict[str, Any]:
+    """Result dictionary returned when an OpenAI request fails."""
+    return {
+        'success': False,
+        'error': str(error),
+        'timestamp': datetime.utcnow().isoformat()
+    }
 
 def analyze_sentiment(
     text: str, 
     model: str = "gpt-3.5-turbo",
-    ticker: Optional[str] = None
+    ticker: Optional[str] = None,
+    enable_cache: bool = True
 ) -> Dict[str, Any]:
     """Analyze the sentiment of a piece of text (e.g., news article, tweet).
     
+    Responses are served from the response cache when the same or a
+    paraphrased text was analyzed recently.
+    
     Args:
         text: The text to analyze
         model: The OpenAI model to use
         ticker: Optional stock ticker for context
+        enable_cache: Whether to use the response cache
         
     Returns:
         Dictionary with sentiment analysis results
@@ -77,53 +452,388 @@ def analyze_sentiment(
         raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
     
     try:
-        # Prepare the prompt
-        prompt = f"""Analyze the sentiment of the following financial text. 
-        {f'Focus on the impact on {ticker} stock. ' if ticker else ''}
+        messages = _sentiment_messages(text, ticker)
+        
+        # Call the OpenAI API
+        def request() -> str:
+            response = _chat_create(
+                model=model,
+                messages=messages,
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+            return response.choices[0].message.content
+        
+        # Only the text is embedded; a paraphrase about another ticker must not match
+        if enable_cache:
+            content = get_response_cache().cached_or_call(
+                model, messages, request, semantic_text=text, scope=_sentiment_scope(ticker)
+            )
+        else:
+            content = request()
+        
+        # Parse the response
+        return _sentiment_result(content, model)
+        
+    except Exception as e:
+        logger.error(f"Error in sentiment analysis: {str(e)}", exc_info=True)
+        return _error_result(e)
+
+async def analyze_sentiment_async(
+    text: str, 
+    model: str = "gpt-3.5-turbo",
+    ticker: Optional[str] = None,
+    enable_cache: bool = True
+) -> Dict[str, Any]:
+    """Asynchronous version of analyze_sentiment.
+    
+    Args:
+        text: The text to analyze
+        model: The OpenAI model to use
+        ticker: Optional stock ticker for context
+        enable_cache: Whether to use the response cache
+        
+    Returns:
+        Dictionary with sentiment analysis results
+        
+    Raises:
+        OpenAIFeatureDisabledError: If OpenAI features are not available
+    """
+    if not check_openai_available():
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    
+    try:
+        messages = _sentiment_messages(text, ticker)
+        
+        async def request() -> str:
+            response = await _chat_create_async(
+                tokens=_estimate_tokens(messages, _DEFAULT_COMPLETION_TOKENS),
+                model=model,
+                messages=messages,
+                temperature=0.3,
+                response_format={"type": "json_object"}
+            )
+            return response.choices[0].message.content
+        
+        if enable_cache:
+            content = await get_response_cache().cached_or_call_async(
+                model, messages, request, semantic_text=text, scope=_sentiment_scope(ticker)
+            )
+        else:
+            content = await request()
+        
+        return _sentiment_result(content, model)
+        
+    except Exception as e:
+        logger.error(f"Error in sentiment analysis: {str(e)}", exc_info=True)
+        return _error_result(e)
+
+async def analyze_sentiments(
+    texts: List[str],
+    model: str = "gpt-3.5-turbo",
+    ticker: Optional[str] = None,
+    max_requests_per_minute: Optional[float] = None,
+    max_tokens_per_minute: Optional[float] = None,
+    enable_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """Analyze the sentiment of many texts concurrently.
+    
+    Requests are issued concurrently and throttled to the configured rate
+    limits, so a sweep over N texts runs at the account's throughput ceiling
+    instead of one request latency per text.
+    
+    Args:
+        texts: The texts to analyze
+        model: The OpenAI model to use
+        ticker: Optional stock ticker for context
+        max_requests_per_minute: Request rate limit (None to keep the current value)
+        max_tokens_per_minute: Token rate limit (None to keep the current value)
+        enable_cache: Whether to use the response cache
+        
+    Returns:
+        List of sentiment analysis results, in the same order as `texts`
+        
+    Raises:
+        OpenAIFeatureDisabledError: If OpenAI features are not available
+    """
+    if not check_openai_available():
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    
+    configure_rate_limits(max_requests_per_minute, max_tokens_per_minute)
+    
+    results = await asyncio.gather(
+        *(analyze_sentiment_async(text, model=model, ticker=ticker, enable_cache=enable_cache) for text in texts),
+        return_exceptions=True
+    )
+    
+    return [_error_result(r) if isinstance(r, BaseException) else r for r in results]
+
+# Context window sizes (tokens) used to cap how many texts share one request
+_MODEL_CONTEXT_TOKENS = {
+    'gpt-3.5-turbo': 16385,
+    'gpt-4': 8192,
+    'gpt-4-turbo': 128000,
+    'gpt-4o': 128000,
+    'gpt-4o-mini': 128000,
+}
+
+# Completion tokens budgeted per text in a packed request
+_PACKED_COMPLETION_TOKENS_PER_TEXT = 150
+
+_PACKED_SENTIMENT_TEMPLATE = """Analyze the sentiment of each of the following {{count}} financial texts.
+        {focus}
         Consider both the tone (positive/negative/neutral) and the confidence level.
         Also identify any key themes or events mentioned that could affect the market.
         
-        Text: {text}
+        {{numbered}}
         
-        Respond with a JSON object containing:
+        Respond with a JSON object {{{{"results": [...]}}}} holding one entry per text,
+        in the same order as the texts, each containing:
         - sentiment: 'positive', 'negative', or 'neutral'
         - confidence: float between 0 and 1
         - themes: array of key themes or events mentioned
         - summary: a brief summary of the sentiment and key points
         """
-        
-        # Call the OpenAI API
-        response = client.chat.completions.create(
+
+_PACKED_SENTIMENT_WITH_TICKER = _PACKED_SENTIMENT_TEMPLATE.format(focus='Focus on the impact on {ticker} stock. ')
+_PACKED_SENTIMENT_NO_TICKER = _PACKED_SENTIMENT_TEMPLATE.format(focus='')
+
+def _packed_sentiment_messages(texts: List[str], ticker: Optional[str] = None) -> List[Dict[str, str]]:
+    """Build the chat messages for a request scoring several texts at once."""
+    numbered = "\n".join(f"Text {i}: {text}" for i, text in enumerate(texts, 1))
+    template = _PACKED_SENTIMENT_WITH_TICKER if ticker else _PACKED_SENTIMENT_NO_TICKER
+    return [
+        {"role": "system", "content": sentiment_system_prompt},
+        {"role": "user", "content": template.format(count=len(texts), numbered=numbered, ticker=ticker)}
+    ]
+
+def _pack_texts(texts: List[str], pack_size: int, model: str) -> List[List[str]]:
+    """Split texts into consecutive packs bounded by count and the model's context window."""
+    # Leave headroom for the instructions and the system message
+    budget = _MODEL_CONTEXT_TOKENS.get(model, 8192) - 1000
+    
+    packs: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for text in texts:
+        cost = len(text) // 4 + _PACKED_COMPLETION_TOKENS_PER_TEXT
+        if current and (len(current) >= pack_size or used + cost > budget):
+            packs.append(current)
+            current = []
+            used = 0
+        current.append(text)
+        used += cost
+    if current:
+        packs.append(current)
+    
+    return packs
+
+async def _analyze_sentiment_pack(
+    texts: List[str],
+    model: str,
+    ticker: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Score one pack of texts with a single chat request."""
+    try:
+        messages = _packed_sentiment_messages(texts, ticker)
+        response = await _chat_create_async(
+            tokens=_estimate_tokens(messages, _PACKED_COMPLETION_TOKENS_PER_TEXT * len(texts)),
             model=model,
-            messages=[
-                {"role": "system", "content": "You are a financial analyst specializing in sentiment analysis of market news."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=0.3,
             response_format={"type": "json_object"}
         )
-        
-        # Parse the response
-        content = response.choices[0].message.content
-        result = json.loads(content)
-        
-        return {
-            'success': True,
-            'sentiment': result.get('sentiment', 'neutral'),
-            'confidence': float(result.get('confidence', 0.5)),
-            'themes': result.get('themes', []),
-            'summary': result.get('summary', ''),
-            'model': model,
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        items = json.loads(response.choices[0].message.content).get('results', [])
         
     except Exception as e:
-        logger.error(f"Error in sentiment analysis: {str(e)}", exc_info=True)
-        return {
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        logger.error(f"Error in packed sentiment analysis: {str(e)}", exc_info=True)
+        return [_error_result(e) for _ in texts]
+    
+    results = []
+    for i in range(len(texts)):
+        if i >= len(items):
+            results.append(_error_result(ValueError("No result returned for this text")))
+            continue
+        try:
+            results.append(_sentiment_record(items[i], model))
+        except Exception as e:
+            # Malformed entry for this text
+            results.append(_error_result(e))
+    
+    return results
+
+async def analyze_sentiments_packed(
+    texts: List[str],
+    pack_size: int = 20,
+    model: str = "gpt-3.5-turbo",
+    ticker: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Analyze the sentiment of many texts, several texts per request.
+    
+    Packing up to `pack_size` texts into each chat request cuts the number of
+    requests by that factor for the same token usage, which raises throughput
+    when the requests-per-minute limit is the binding one. Packs are also
+    capped so they fit the model's context window.
+    
+    Args:
+        texts: The texts to analyze
+        pack_size: Maximum number of texts per request
+        model: The OpenAI model to use
+        ticker: Optional stock ticker for context
+        
+    Returns:
+        List of sentiment analysis results, in the same order as `texts`
+        
+    Raises:
+        OpenAIFeatureDisabledError: If OpenAI features are not available
+    """
+    if not check_openai_available():
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    
+    packs = _pack_texts(texts, max(1, pack_size), model)
+    pack_results = await asyncio.gather(
+        *(_analyze_sentiment_pack(pack, model, ticker) for pack in packs)
+    )
+    
+    return [result for results in pack_results for result in results]
+
+def submit_sentiment_batch(
+    texts: List[str],
+    model: str = "gpt-3.5-turbo",
+    ticker: Optional[str] = None
+) -> str:
+    """Submit a sentiment analysis sweep to the OpenAI Batch API.
+    
+    Batch requests cost half as much as synchronous ones and draw on a
+    separate rate-limit pool, at the price of up to 24 hours of turnaround.
+    
+    Args:
+        texts: The texts to analyze
+        model: The OpenAI model to use
+        ticker: Optional stock ticker for context
+        
+    Returns:
+        ID of the created batch, to be passed to wait_for_batch
+        
+    Raises:
+        OpenAIFeatureDisabledError: If OpenAI features are not available
+    """
+    client = get_client()
+    if client is None:
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    
+    # One JSONL line per text; custom_id carries the input position
+    lines = [
+        json.dumps({
+            "custom_id": f"req-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": _sentiment_messages(text, ticker),
+                "temperature": 0.3,
+                "response_format": {"type": "json_object"}
+            }
+        })
+        for i, text in enumerate(texts)
+    ]
+    
+    batch_input = client.files.create(
+        file=("sentiment_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_input.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    
+    logger.info(f"Submitted sentiment batch {batch.id} with {len(texts)} requests")
+    return batch.id
+
+def _batch_index(custom_id: str) -> int:
+    """Input position encoded in a batch request's custom_id ('req-<i>')."""
+    return int(custom_id.rsplit('-', 1)[1])
+
+def wait_for_batch(batch_id: str, poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+    """Wait for a Batch API job to finish and return its per-request results.
+    
+    Args:
+        batch_id: ID returned by submit_sentiment_batch
+        poll_interval: Seconds between status checks
+        
+    Returns:
+        List of batch result records (with 'custom_id', 'response' and
+        'error' keys), ordered by input position
+        
+    Raises:
+        OpenAIFeatureDisabledError: If OpenAI features are not available
+        RuntimeError: If the batch failed, expired or was cancelled
+    """
+    client = get_client()
+    if client is None:
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status == 'completed':
+            break
+        if batch.status in ('failed', 'expired', 'cancelled'):
+            raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+        time.sleep(poll_interval)
+    
+    # Successful and failed requests are reported in separate files
+    records: List[Dict[str, Any]] = []
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if file_id:
+            content = client.files.content(file_id).text
+            records.extend(json.loads(line) for line in content.splitlines() if line.strip())
+    
+    records.sort(key=lambda record: _batch_index(record['custom_id']))
+    return records
+
+def analyze_sentiments_batch(
+    texts: List[str],
+    model: str = "gpt-3.5-turbo",
+    ticker: Optional[str] = None,
+    poll_interval: float = 30.0
+) -> List[Dict[str, Any]]:
+    """Analyze the sentiment of many texts through the OpenAI Batch API.
+    
+    Intended for offline sweeps (backtests, overnight analytics) where the
+    up to 24 hour turnaround is acceptable in exchange for half the cost.
+    This call blocks until the batch has finished.
+    
+    Args:
+        texts: The texts to analyze
+        model: The OpenAI model to use
+        ticker: Optional stock ticker for context
+        poll_interval: Seconds between batch status checks
+        
+    Returns:
+        List of sentiment analysis results, in the same order as `texts`
+        
+    Raises:
+        OpenAIFeatureDisabledError: If OpenAI features are not available
+        RuntimeError: If the batch failed, expired or was cancelled
+    """
+    batch_id = submit_sentiment_batch(texts, model=model, ticker=ticker)
+    
+    results = [_error_result(RuntimeError("No result returned by the batch")) for _ in texts]
+    for record in wait_for_batch(batch_id, poll_interval=poll_interval):
+        i = _batch_index(record['custom_id'])
+        response = record.get('response') or {}
+        if record.get('error') or response.get('status_code') != 200:
+            results[i] = _error_result(RuntimeError(str(record.get('error') or response.get('body'))))
+            continue
+        
+        try:
+            results[i] = _sentiment_result(response['body']['choices'][0]['message']['content'], model)
+        except Exception as e:
+            logger.error(f"Error parsing batch sentiment result: {str(e)}", exc_info=True)
+            results[i] = _error_result(e)
+    
+    return results
 
 explain_trade_system_prompt = """You are an experienced financial analyst explaining trading decisions in clear, 
 concise language. Your audience includes both professional traders and retail investors.
@@ -137,6 +847,120 @@ For each trade, provide:
 Keep explanations under 3 sentences and avoid financial jargon when possible.
 """
 
+_EXPLAIN_TRADE_TEMPLATE = """Explain this {action} trade in simple terms:
+        
+        Ticker: {ticker}
+        Action: {action}
+        Price: ${price:.2f}
+        Quantity: {quantity}
+        
+        Technical indicators:
+        {indicators_str}
+        {context_str}
+        
+        Provide a clear, concise explanation that would be helpful for a trader to understand the rationale.
+        """
+
+def _explain_trade_messages(
+    ticker: str,
+    action: str,
+    price: float,
+    quantity: int,
+    indicators: Dict[str, Any],
+    market_context: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, str]]:
+    """Build the chat messages for a trade explanation request."""
+    # Format the indicators for the prompt
+    indicators_str = "\n".join(f"- {k}: {v}" for k, v in indicators.items())
+    
+    # Add market context if available
+    context_str = ""
+    if market_context:
+        context_str = "\nMarket context:\n" + "\n".join(f"- {k}: {v}" for k, v in market_context.items())
+    
+    user_message = _EXPLAIN_TRADE_TEMPLATE.format_map({
+        'ticker': ticker,
+        'action': action.upper(),
+        'price': price,
+        'quantity': quantity,
+        'indicators_str': indicators_str,
+        'context_str': context_str,
+    })
+    
+    return [
+        {"role": "system", "content": explain_trade_system_prompt},
+        {"role": "user", "content": user_message}
+    ]
+
+def _explain_trade_result(
+    content: str,
+    ticker: str,
+    action: str,
+    price: float,
+    quantity: int,
+    model: str
+) -> Dict[str, Any]:
+    """Wrap a trade explanation response into the result dictionary."""
+    return {
+        'success': True,
+        'explanation': content.strip(),
+        'ticker': ticker,
+        'action': action,
+        'price': price,
+        'quantity': quantity,
+        'model': model,
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+# Trades whose indicators agree to this many significant figures share an explanation
+_CLUSTER_SIGNIFICANT_FIGURES = 2
+_CLUSTER_CACHE_SIZE = 10_000
+
+_cluster_explanations: "OrderedDict[str, str]" = OrderedDict()
+_cluster_lock = threading.Lock()
+
+def _quantize_value(value: Any) -> Any:
+    """Round a number (but not a bool) to _CLUSTER_SIGNIFICANT_FIGURES; other values pass through."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(f"{value:.{_CLUSTER_SIGNIFICANT_FIGURES}g}")
+    return value
+
+def _quantize(values: Optional[Dict[str, Any]]) -> tuple:
+    """Sorted (name, value) pairs with numbers rounded to _CLUSTER_SIGNIFICANT_FIGURES."""
+    if not values:
+        return ()
+    return tuple((k, _quantize_value(v)) for k, v in sorted(values.items()))
+
+def _trade_cluster_key(
+    ticker: str,
+    action: str,
+    indicators: Dict[str, Any],
+    market_context: Optional[Dict[str, Any]],
+    model: str
+) -> str:
+    """Key shared by trades of the same ticker and action with near-identical indicators."""
+    key = (ticker, action.lower(), model, _quantize(indicators), _quantize(market_context))
+    return hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+
+def _cluster_get(key: str) -> Optional[str]:
+    with _cluster_lock:
+        explanation = _cluster_explanations.get(key)
+        if explanation is not None:
+            _cluster_explanations.move_to_end(key)
+        return explanation
+
+def _cluster_put(key: str, explanation: str) -> None:
+    with _cluster_lock:
+        _cluster_explanations[key] = explanation
+        _cluster_explanations.move_to_end(key)
+        while len(_cluster_explanations) > _CLUSTER_CACHE_SIZE:
+            _cluster_explanations.popitem(last=False)
+
+def clear_trade_explanation_cache() -> None:
+    """Forget the explanations reused across similar trades by explain_trade."""
+    with _cluster_lock:
+        _cluster_explanations.clear()
+
 def explain_trade(
     ticker: str,
     action: str,
@@ -144,7 +968,9 @@ def explain_trade(
     quantity: int,
     indicators: Dict[str, Any],
     market_context: Optional[Dict[str, Any]] = None,
-    model: str = "gpt-3.5-turbo"
+    model: str = "gpt-3.5-turbo",
+    enable_cache: bool = True,
+    reuse_similar: bool = True
 ) -> Dict[str, Any]:
     """Generate a natural language explanation for a trade.
     
@@ -156,6 +982,11 @@ def explain_trade(
         indicators: Dictionary of technical indicators and their values
         market_context: Optional dictionary with market context (e.g., VIX, sector performance)
         model: The OpenAI model to use
+        enable_cache: Whether to use the (exact-match) response cache
+        reuse_similar: Whether to reuse the explanation of an earlier trade with
+                       the same ticker and action whose indicators (and market
+                       context) match to 2 significant figures; the returned
+                       price and quantity are always this trade's
         
     Returns:
         Dictionary with the explanation and metadata
@@ -167,61 +998,101 @@ def explain_trade(
         raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
     
     try:
-        # Format the indicators for the prompt
-        indicators_str = "\n".join([f"- {k}: {v}" for k, v in indicators.items()])
-        
-        # Add market context if available
-        context_str = ""
-        if market_context:
-            context_str = "\nMarket context:\n" + "\n".join(
-                [f"- {k}: {v}" for k, v in market_context.items()]
+        cluster_key = _trade_cluster_key(ticker, action, indicators, market_context, model) if reuse_similar else None
+        cached = _cluster_get(cluster_key) if cluster_key else None
+        if cached is not None:
+            return _explain_trade_result(cached, ticker, action, price, quantity, model)
+        
+        messages = _explain_trade_messages(ticker, action, price, quantity, indicators, market_context)
+        
+        # Call the OpenAI API
+        def request() -> str:
+            response = _chat_create(
+                model=model,
+                messages=messages,
+                temperature=0.3
             )
+            return response.choices[0].message.content
         
-        # Create the user message
-        user_message = f"""Explain this {action.upper()} trade in simple terms:
+        # Trades differing only in their numbers embed almost identically, so only exact hits are safe
+        if enable_cache:
+            content = get_response_cache().cached_or_call(model, messages, request, semantic=False)
+        else:
+            content = request()
         
-        Ticker: {ticker}
-        Action: {action.upper()}
-        Price: ${price:.2f}
-        Quantity: {quantity}
+        if cluster_key:
+            _cluster_put(cluster_key, content)
+        return _explain_trade_result(content, ticker, action, price, quantity, model)
         
-        Technical indicators:
-        {indicators_str}
-        {context_str}
+    except Exception as e:
+        logger.error(f"Error generating trade explanation: {str(e)}", exc_info=True)
+        return _error_result(e)
+
+async def explain_trade_async(
+    ticker: str,
+    action: str,
+    price: float,
+    quantity: int,
+    indicators: Dict[str, Any],
+    market_context: Optional[Dict[str, Any]] = None,
+    model: str = "gpt-3.5-turbo",
+    enable_cache: bool = True,
+    reuse_similar: bool = True
+) -> Dict[str, Any]:
+    """Asynchronous version of explain_trade.
+    
+    Args:
+        ticker: Stock ticker symbol
+        action: 'buy' or 'sell'
+        price: Execution price
+        quantity: Number of shares
+        indicators: Dictionary of technical indicators and their values
+        market_context: Optional dictionary with market context (e.g., VIX, sector performance)
+        model: The OpenAI model to use
+        enable_cache: Whether to use the (exact-match) response cache
+        reuse_similar: Whether to reuse the explanation of an earlier trade with
+                       the same ticker and action whose indicators (and market
+                       context) match to 2 significant figures; the returned
+                       price and quantity are always this trade's
         
-        Provide a clear, concise explanation that would be helpful for a trader to understand the rationale.
-        """
+    Returns:
+        Dictionary with the explanation and metadata
         
-        # Call the OpenAI API
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": explain_trade_system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.3
-        )
+    Raises:
+        OpenAIFeatureDisabledError: If OpenAI features are not available
+    """
+    if not check_openai_available():
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    
+    try:
+        cluster_key = _trade_cluster_key(ticker, action, indicators, market_context, model) if reuse_similar else None
+        cached = _cluster_get(cluster_key) if cluster_key else None
+        if cached is not None:
+            return _explain_trade_result(cached, ticker, action, price, quantity, model)
+        
+        messages = _explain_trade_messages(ticker, action, price, quantity, indicators, market_context)
+        
+        async def request() -> str:
+            response = await _chat_create_async(
+                tokens=_estimate_tokens(messages, _DEFAULT_COMPLETION_TOKENS),
+                model=model,
+                messages=messages,
+                temperature=0.3
+            )
+            return response.choices[0].message.content
         
-        explanation = response.choices[0].message.content.strip()
+        if enable_cache:
+            content = await get_response_cache().cached_or_call_async(model, messages, request, semantic=False)
+        else:
+            content = await request()
         
-        return {
-            'success': True,
-            'explanation': explanation,
-            'ticker': ticker,
-            'action': action,
-            'price': price,
-            'quantity': quantity,
-            'model': model,
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        if cluster_key:
+            _cluster_put(cluster_key, content)
+        return _explain_trade_result(content, ticker, action, price, quantity, model)
         
     except Exception as e:
         logger.error(f"Error generating trade explanation: {str(e)}", exc_info=True)
-        return {
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        return _error_result(e)
 
 generate_strategy_system_prompt = """You are an expert quantitative strategist with deep knowledge of algorithmic trading. 
 Your task is to generate Python code for trading strategies based on natural language descriptions.
@@ -238,6 +1109,37 @@ When generating code:
 Only respond with the Python code, no additional explanation or markdown formatting.
 """
 
+_STRATEGY_TEMPLATE = """Generate Python code for the following trading strategy:
+        
+        {description}
+        
+        Please provide a complete, well-documented Python class that implements this strategy.
+        """
+
+def _strategy_messages(description: str) -> List[Dict[str, str]]:
+    """Build the chat messages for a strategy generation request."""
+    return [
+        {"role": "system", "content": generate_strategy_system_prompt},
+        {"role": "user", "content": _STRATEGY_TEMPLATE.format(description=description)}
+    ]
+
+def _strategy_result(content: str, model: str) -> Dict[str, Any]:
+    """Extract the generated code from a strategy generation response."""
+    code = content.strip()
+    
+    # Clean up the response (remove markdown code blocks if present)
+    if '```python' in code:
+        code = code.split('```python')[1].split('```')[0]
+    elif '```' in code:
+        code = code.split('```')[1].split('```')[0]
+    
+    return {
+        'success': True,
+        'code': code,
+        'model': model,
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
 def generate_strategy_code(
     description: str,
     model: str = "gpt-4"
@@ -258,44 +1160,51 @@ def generate_strategy_code(
         raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
     
     try:
-        # Create the user message
-        user_message = f"""Generate Python code for the following trading strategy:
-        
-        {description}
-        
-        Please provide a complete, well-documented Python class that implements this strategy.
-        """
-        
         # Call the OpenAI API
-        response = client.chat.completions.create(
+        response = _chat_create(
             model=model,
-            messages=[
-                {"role": "system", "content": generate_strategy_system_prompt},
-                {"role": "user", "content": user_message}
-            ],
+            messages=_strategy_messages(description),
             temperature=0.2,
             max_tokens=2000
         )
         
-        code = response.choices[0].message.content.strip()
+        return _strategy_result(response.choices[0].message.content, model)
         
-        # Clean up the response (remove markdown code blocks if present)
-        if '```python' in code:
-            code = code.split('```python')[1].split('```')[0]
-        elif '```' in code:
-            code = code.split('```')[1].split('```')[0]
+    except Exception as e:
+        logger.error(f"Error generating strategy code: {str(e)}", exc_info=True)
+        return _error_result(e)
+
+async def generate_strategy_code_async(
+    description: str,
+    model: str = "gpt-4"
+) -> Dict[str, Any]:
+    """Asynchronous version of generate_strategy_code.
+    
+    Args:
+        description: Natural language description of the strategy
+        model: The OpenAI model to use
+        
+    Returns:
+        Dictionary with the generated code and metadata
+        
+    Raises:
+        OpenAIFeatureDisabledError: If OpenAI features are not available
+    """
+    if not check_openai_available():
+        raise OpenAIFeatureDisabledError("OpenAI features are disabled or not configured")
+    
+    try:
+        messages = _strategy_messages(description)
+        response = await _chat_create_async(
+            tokens=_estimate_tokens(messages, 2000),
+            model=model,
+            messages=messages,
+            temperature=0.2,
+            max_tokens=2000
+        )
         
-        return {
-            'success': True,
-            'code': code,
-            'model': model,
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        return _strategy_result(response.choices[0].message.content, model)
         
     except Exception as e:
         logger.error(f"Error generating strategy code: {str(e)}", exc_info=True)
-        return {
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        return _error_result(e)
@@ -1,26 +1,381 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple, Type, Optional, Union
 import math
 
-def calculate_returns(prices: Union[pd.Series, np.ndarray], method: str = 'simple') -> Union[pd.Series, np.ndarray]:
+from ._njit import NUMBA_AVAILABLE, _float_sigs, jitclass, njit
+
+if NUMBA_AVAILABLE:
+    from numba import types as numba_types
+
+# Above this many values the moment sums switch to Kahan-compensated accumulation
+_KAHAN_MIN_SIZE = 1_000_000
+
+def _asarray(x: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """Contiguous float array of a Series or array-like, converted once at function entry.
+    
+    float32 data stays float32: the reduction kernels read half the bytes and
+    accumulate in float64 locals, so precision is only limited by the stored
+    values themselves. Everything else becomes float64; float64 data is not
+    downcast, since converting it would cost a full read and write of the
+    array to save less than that on a single reduction.
+    """
+    arr = x.to_numpy(copy=False) if isinstance(x, pd.Series) else np.asarray(x)
+    if arr.dtype != np.float32:
+        arr = arr.astype(np.float64, copy=False)
+    return np.ascontiguousarray(arr)
+
+@njit(inline='always')
+def _kahan_add(total: float, compensation: float, value: float):
+    """One step of Kahan summation; returns the new (total, compensation)."""
+    y = value - compensation
+    t = total + y
+    return t, (t - total) - y
+
+class _Moments(NamedTuple):
+    """Result of _return_moments; statistics other than `growth` are of the excess returns."""
+    n: float
+    mean: float
+    var: float
+    n_down: float
+    down_mean: float
+    down_var: float
+    growth: float
+
+@njit(_float_sigs('UniTuple(float64, 7)({ro}, float64, boolean, boolean)'), cache=True)
+def _return_moments_jit(returns: np.ndarray, shift: float, skipna: bool, compensated: bool):
+    """Mean and sample variance of ``returns - shift`` and of its negative values, in one pass.
+    
+    Returns (n, mean, var, n_down, down_mean, down_var, growth), where
+    growth is the compounded product of (1 + return); a variance is NaN when
+    fewer than two values contribute. Sums are taken around the first value of
+    each group, which keeps the one-pass variance exact for constant series and
+    avoids cancellation when the mean is large relative to the spread.
+    
+    All accumulators are float64 whatever the input type. With `compensated`
+    the sums use Kahan summation, which keeps their error independent of the
+    length of very long (tick-level) histories at about four extra flops per sum.
+    """
+    n = 0
+    growth = 1.0
+    pivot = 0.0
+    s = 0.0
+    s2 = 0.0
+    c = 0.0
+    c2 = 0.0
+    n_down = 0
+    pivot_down = 0.0
+    s_down = 0.0
+    s2_down = 0.0
+    c_down = 0.0
+    c2_down = 0.0
+    for i in range(returns.shape[0]):
+        x = returns[i] - shift
+        if skipna and np.isnan(x):
+            continue
+        if n == 0:
+            pivot = x
+        growth *= 1.0 + returns[i]
+        d = x - pivot
+        n += 1
+        if compensated:
+            s, c = _kahan_add(s, c, d)
+            s2, c2 = _kahan_add(s2, c2, d * d)
+        else:
+            s += d
+            s2 += d * d
+        if x < 0:
+            if n_down == 0:
+                pivot_down = x
+            d = x - pivot_down
+            n_down += 1
+            if compensated:
+                s_down, c_down = _kahan_add(s_down, c_down, d)
+                s2_down, c2_down = _kahan_add(s2_down, c2_down, d * d)
+            else:
+                s_down += d
+                s2_down += d * d
+    
+    mean = pivot + s / n if n > 0 else np.nan
+    var = (s2 - s * s / n) / (n - 1) if n > 1 else np.nan
+    down_mean = pivot_down + s_down / n_down if n_down > 0 else np.nan
+    down_var = (s2_down - s_down * s_down / n_down) / (n_down - 1) if n_down > 1 else np.nan
+    # Rounding can leave a tiny negative variance; NaN passes through
+    if var < 0.0:
+        var = 0.0
+    if down_var < 0.0:
+        down_var = 0.0
+    return float(n), mean, var, float(n_down), down_mean, down_var, growth
+
+def _return_moments_numpy(returns: np.ndarray, shift: float, skipna: bool, compensated: bool):
+    """NumPy equivalent of _return_moments_jit, used when numba is not installed.
+    
+    `compensated` is accepted for signature compatibility; NumPy's pairwise
+    summation already keeps the rounding error low on long arrays.
+    """
+    r = returns.astype(np.float64)
+    if skipna:
+        r = r[~np.isnan(r)]
+    x = r - shift
+    down = x[x < 0]
+    
+    def stats(v):
+        mean = v.mean() if v.size > 0 else np.nan
+        var = v.var(ddof=1) if v.size > 1 else np.nan
+        return float(v.size), mean, var
+    
+    return stats(x) + stats(down) + (np.prod(1.0 + r),)
+
+_return_moments: Callable[[np.ndarray, float, bool, bool], Tuple[float, ...]]
+if NUMBA_AVAILABLE:
+    _return_moments = _return_moments_jit
+else:
+    # Interpreting the loop above in Python would be far slower than NumPy's reductions
+    _return_moments = _return_moments_numpy
+
+@njit(_float_sigs('float64({ro})'), cache=True)
+def _max_drawdown(prices: np.ndarray) -> float:
+    """Most negative drawdown from the running peak, tracked in a single scan.
+    
+    Missing prices are skipped, and no drawdown is measured against a
+    non-positive peak, where it is undefined.
+    """
+    peak = np.nan
+    worst = 0.0
+    for i in range(prices.shape[0]):
+        p = prices[i]
+        if np.isnan(p):
+            continue
+        if np.isnan(peak) or p > peak:
+            peak = p
+        elif peak > 0:
+            dd = (p - peak) / peak
+            if dd < worst:
+                worst = dd
+    return worst
+
+@njit(_float_sigs('UniTuple(float64, 5)({ro}, {ro})'), cache=True)
+def _cov_stats(a: np.ndarray, b: np.ndarray):
+    """Means and co-moments of two equal-length series from a single pass.
+    
+    Returns (n, mean_a, mean_b, sxy, syy) where sxy = sum((a - mean_a) * (b - mean_b))
+    and syy = sum((b - mean_b) ** 2); sums run around the first pair of values
+    so the one-pass formulas don't lose precision to cancellation.
+    """
+    n = a.shape[0]
+    if n == 0:
+        return 0.0, np.nan, np.nan, np.nan, np.nan
+    pivot_a = a[0]
+    pivot_b = b[0]
+    sa = 0.0
+    sb = 0.0
+    sab = 0.0
+    sbb = 0.0
+    for i in range(n):
+        x = a[i] - pivot_a
+        y = b[i] - pivot_b
+        sa += x
+        sb += y
+        sab += x * y
+        sbb += y * y
+    return float(n), pivot_a + sa / n, pivot_b + sb / n, sab - sa * sb / n, sbb - sb * sb / n
+
+def _beta_and_means(
+    asset_returns: Union[pd.Series, np.ndarray],
+    benchmark_returns: Union[pd.Series, np.ndarray]
+) -> Tuple[float, float, float]:
+    """Beta and the mean per-period returns of asset and benchmark from one _cov_stats call."""
+    a = _asarray(asset_returns)
+    b = _asarray(benchmark_returns)
+    if a.dtype != b.dtype:
+        a = a.astype(np.float64)
+        b = b.astype(np.float64)
+    
+    _, mean_a, mean_b, sxy, syy = _cov_stats(a, b)
+    beta = sxy / syy if syy != 0 else np.nan
+    return beta, mean_a, mean_b
+
+def _var_cvar(returns: Union[pd.Series, np.ndarray], confidence_level: float) -> Tuple[float, float]:
+    """Historical VaR and CVaR from one partial sort of the returns.
+    
+    VaR is the same linearly interpolated percentile np.percentile gives,
+    but only the two order statistics around it are selected (O(n)
+    introselect instead of a full sort); CVaR averages the partition's
+    lower side, which already holds every return at or below VaR.
+    """
+    arr = _asarray(returns)
+    n = arr.size
+    if np.isnan(arr).any():
+        return np.nan, np.nan
+    
+    # Interpolation position exactly as np.percentile computes it
+    h = (n - 1) * (((1 - confidence_level) * 100) / 100)
+    lo = min(max(int(np.floor(h)), 0), n - 1)
+    hi = min(lo + 1, n - 1)
+    part = np.partition(arr, (lo, hi))
+    
+    a, b = float(part[lo]), float(part[hi])
+    t = h - lo
+    var = a + (b - a) * t if t < 0.5 else b - (b - a) * (1 - t)
+    
+    # Values past `lo` are >= part[hi], so they can only reach VaR through ties
+    if part[hi] <= var and hi > lo:
+        tail = part[lo + 1:]
+        ties = tail[tail <= var]
+        cvar = (part[:lo + 1].sum(dtype=np.float64) + ties.sum(dtype=np.float64)) / (lo + 1 + ties.size)
+    else:
+        cvar = part[:lo + 1].mean(dtype=np.float64)
+    return var, cvar
+
+@njit(inline='always')
+def _combine_drawdown(max_a: float, min_a: float, mdd_a: float, max_b: float, min_b: float, mdd_b: float):
+    """Merge the (max, min, max drawdown) summaries of two consecutive price segments."""
+    mdd = min(mdd_a, mdd_b)
+    # The worst drawdown spanning both runs from segment a's peak to segment b's trough
+    if max_a > 0 and min_b < np.inf:
+        cross = (min_b - max_a) / max_a
+        if cross < mdd:
+            mdd = cross
+    return max(max_a, max_b), min(min_a, min_b), mdd
+
+@njit(_float_sigs('float64[:]({ro}, int64)'), cache=True)
+def _rolling_max_drawdown(prices: np.ndarray, window: int) -> np.ndarray:
+    """Exact max drawdown of every trailing window in O(n).
+    
+    The series is cut into blocks of `window` bars; each bar gets the
+    drawdown summary from its block start (prefix) and to its block end
+    (suffix). A window then spans at most two blocks and is the suffix of
+    its first bar merged with the prefix of its last. Missing prices are
+    skipped, as in _max_drawdown.
+    """
+    n = prices.shape[0]
+    out = np.full(n, np.nan)
+    pre_max = np.empty(n)
+    pre_min = np.empty(n)
+    pre_mdd = np.empty(n)
+    suf_max = np.empty(n)
+    suf_min = np.empty(n)
+    suf_mdd = np.empty(n)
+    
+    for i in range(n):
+        p = prices[i]
+        hi, lo = (-np.inf, np.inf) if np.isnan(p) else (p, p)
+        if i % window == 0:
+            pre_max[i], pre_min[i], pre_mdd[i] = hi, lo, 0.0
+        else:
+            pre_max[i], pre_min[i], pre_mdd[i] = _combine_drawdown(
+                pre_max[i - 1], pre_min[i - 1], pre_mdd[i - 1], hi, lo, 0.0
+            )
+    
+    for i in range(n - 1, -1, -1):
+        p = prices[i]
+        hi, lo = (-np.inf, np.inf) if np.isnan(p) else (p, p)
+        if i == n - 1 or (i + 1) % window == 0:
+            suf_max[i], suf_min[i], suf_mdd[i] = hi, lo, 0.0
+        else:
+            suf_max[i], suf_min[i], suf_mdd[i] = _combine_drawdown(
+                hi, lo, 0.0, suf_max[i + 1], suf_min[i + 1], suf_mdd[i + 1]
+            )
+    
+    for i in range(window - 1, n):
+        start = i - window + 1
+        if start % window == 0:
+            out[i] = pre_mdd[i]
+        else:
+            out[i] = _combine_drawdown(
+                suf_max[start], suf_min[start], suf_mdd[start], pre_max[i], pre_min[i], pre_mdd[i]
+            )[2]
+    return out
+
+def _rolling_moments(returns: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and sample variance of every trailing window from prefix sums, in O(n).
+    
+    Returns full-length arrays, NaN for the first window-1 positions and for
+    windows that contain a missing value (as pandas' rolling does). Values are
+    centred on the overall mean before the cumulative sums so the window
+    differences don't lose precision over long histories.
+    """
+    r = returns.astype(np.float64, copy=False)
+    missing = np.isnan(r)
+    center = r[~missing].mean() if not missing.all() else 0.0
+    x = np.where(missing, 0.0, r - center)
+    
+    cs = np.concatenate(([0.0], np.cumsum(x)))
+    cs2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    gaps = np.concatenate(([0], np.cumsum(missing)))
+    
+    sums = cs[window:] - cs[:-window]
+    sums2 = cs2[window:] - cs2[:-window]
+    sq_dev = sums2 - sums * sums / window
+    # Differences below the prefix sums' rounding error are a zero variance
+    sq_dev[sq_dev <= 8 * np.finfo(np.float64).eps * cs2[window:]] = 0.0
+    
+    mean = np.full(r.size, np.nan)
+    var = np.full(r.size, np.nan)
+    complete = (gaps[window:] - gaps[:-window]) == 0
+    mean[window - 1:] = np.where(complete, sums / window + center, np.nan)
+    var[window - 1:] = np.where(complete, sq_dev / (window - 1), np.nan)
+    return mean, var
+
+def _like_input(values: np.ndarray, template: Union[pd.Series, np.ndarray]) -> Union[pd.Series, np.ndarray]:
+    """Wrap a full-length result as a Series on the input's index when the input was a Series."""
+    if isinstance(template, pd.Series):
+        return pd.Series(values, index=template.index, name=template.name)
+    return values
+
+def _moments(returns: Union[pd.Series, np.ndarray], shift: float = 0.0) -> _Moments:
+    """Run _return_moments on a Series (NaN skipped, as pandas does) or an array."""
+    arr = _asarray(returns)
+    return _Moments(*_return_moments(arr, shift, isinstance(returns, pd.Series), arr.size > _KAHAN_MIN_SIZE))
+
+def _active_moments(
+    asset_returns: Union[pd.Series, np.ndarray],
+    benchmark_returns: Union[pd.Series, np.ndarray]
+) -> Tuple[float, float, float]:
+    """(mean, sample variance, count) of the positional differences asset - benchmark."""
+    skipna = isinstance(asset_returns, pd.Series) or isinstance(benchmark_returns, pd.Series)
+    active = _asarray(asset_returns) - _asarray(benchmark_returns)
+    m = _Moments(*_return_moments(active, 0.0, skipna, active.size > _KAHAN_MIN_SIZE))
+    return m.mean, m.var, m.n
+
+def calculate_returns(
+    prices: Union[pd.Series, np.ndarray],
+    method: str = 'simple',
+    return_series: bool = True
+) -> Union[pd.Series, np.ndarray]:
     """Calculate returns from price data.
     
     Args:
         prices: Series or array of prices
         method: 'simple' for simple returns, 'log' for log returns
+        return_series: If False, always return a plain ndarray and skip
+                       building an indexed Series for Series input
         
     Returns:
         Series or array of returns
     """
-    if method == 'simple':
-        returns = prices.pct_change().dropna() if isinstance(prices, pd.Series) else np.diff(prices) / prices[:-1]
-    elif method == 'log':
-        returns = np.log(prices / prices.shift(1)).dropna() if isinstance(prices, pd.Series) else np.log(prices[1:] / prices[:-1])
-    else:
+    if method not in ('simple', 'log'):
         raise ValueError("method must be 'simple' or 'log'")
     
-    return returns
+    series: Optional[pd.Series] = prices if isinstance(prices, pd.Series) else None
+    arr = np.asarray(prices) if series is None else series.to_numpy(dtype=np.float64, copy=False)
+    
+    ratio = arr[1:] / arr[:-1]
+    returns = ratio - 1.0 if method == 'simple' else np.log(ratio)
+    
+    if series is None:
+        return returns
+    
+    # Match pct_change().dropna(): periods touching a missing price are dropped
+    index = series.index[1:]
+    missing = np.isnan(returns)
+    if missing.any():
+        returns = returns[~missing]
+        index = index[~missing]
+    
+    if not return_series:
+        return returns
+    return pd.Series(returns, index=index, name=series.name)
 
 def calculate_annualized_return(returns: Union[pd.Series, np.ndarray], periods_per_year: int = 252) -> float:
     """Calculate annualized return from return series.
@@ -36,10 +391,9 @@ def calculate_annualized_return(returns: Union[pd.Series, np.ndarray], periods_p
     if n_periods == 0:
         return 0.0
     
-    if isinstance(returns, pd.Series):
-        cumulative_return = (1 + returns).prod() - 1
-    else:
-        cumulative_return = np.prod(1 + returns) - 1
+    # Series input skips missing returns, as Series.prod() does
+    prod = np.nanprod if isinstance(returns, pd.Series) else np.prod
+    cumulative_return = prod(np.add(_asarray(returns), 1.0, dtype=np.float64)) - 1
     
     # Annualize the return
     if n_periods < periods_per_year:
@@ -62,10 +416,7 @@ def calculate_annualized_volatility(returns: Union[pd.Series, np.ndarray], perio
     if len(returns) < 2:
         return 0.0
     
-    if isinstance(returns, pd.Series):
-        return returns.std() * np.sqrt(periods_per_year)
-    else:
-        return np.std(returns, ddof=1) * np.sqrt(periods_per_year)
+    return np.sqrt(_moments(returns).var) * np.sqrt(periods_per_year)
 
 def calculate_sharpe_ratio(
     returns: Union[pd.Series, np.ndarray], 
@@ -85,14 +436,9 @@ def calculate_sharpe_ratio(
     if len(returns) < 2:
         return 0.0
     
-    excess_returns = returns - (risk_free_rate / periods_per_year)
-    
-    if isinstance(returns, pd.Series):
-        return_per_period = excess_returns.mean()
-        vol_per_period = excess_returns.std()
-    else:
-        return_per_period = np.mean(excess_returns)
-        vol_per_period = np.std(excess_returns, ddof=1)
+    m = _moments(returns, risk_free_rate / periods_per_year)
+    return_per_period = m.mean
+    vol_per_period = np.sqrt(m.var)
     
     if vol_per_period == 0:
         return 0.0
@@ -118,21 +464,13 @@ def calculate_sortino_ratio(
     if len(returns) < 2:
         return 0.0
     
-    excess_returns = returns - (risk_free_rate / periods_per_year)
+    m = _moments(returns, risk_free_rate / periods_per_year)
+    return_per_period = m.mean
     
-    if isinstance(returns, pd.Series):
-        return_per_period = excess_returns.mean()
-        # Only consider negative returns for downside deviation
-        downside_returns = excess_returns[excess_returns < 0]
-        if len(downside_returns) == 0:
-            return float('inf')
-        downside_dev = downside_returns.std(ddof=1)
-    else:
-        return_per_period = np.mean(excess_returns)
-        downside_returns = excess_returns[excess_returns < 0]
-        if len(downside_returns) == 0:
-            return float('inf')
-        downside_dev = np.std(downside_returns, ddof=1)
+    # Only negative excess returns count towards the downside deviation
+    if m.n_down == 0:
+        return float('inf')
+    downside_dev = np.sqrt(m.down_var)
     
     if downside_dev == 0:
         return float('inf')
@@ -149,20 +487,10 @@ def calculate_max_drawdown(prices: Union[pd.Series, np.ndarray]) -> float:
     Returns:
         Maximum drawdown as a decimal (e.g., 0.15 for 15%)
     """
-    if isinstance(prices, pd.Series):
-        prices = prices.values
-    
     if len(prices) < 2:
         return 0.0
     
-    # Calculate cumulative max
-    cum_max = np.maximum.accumulate(prices)
-    
-    # Calculate drawdown
-    drawdown = (prices - cum_max) / cum_max
-    
-    # Return minimum (most negative) drawdown
-    return np.min(drawdown)
+    return _max_drawdown(_asarray(prices))
 
 def calculate_calmar_ratio(
     returns: Union[pd.Series, np.ndarray], 
@@ -190,37 +518,44 @@ def calculate_calmar_ratio(
     
     return annualized_return / abs(max_dd)
 
-def calculate_win_rate(trades: pd.DataFrame, pnl_column: str = 'pnl') -> float:
+def _trade_pnl(trades: Union[pd.DataFrame, np.ndarray], pnl_column: str) -> np.ndarray:
+    """P&L values of the trades as an ndarray, without slicing the DataFrame."""
+    if isinstance(trades, pd.DataFrame):
+        return trades[pnl_column].to_numpy(copy=False)
+    return np.asarray(trades)
+
+def calculate_win_rate(trades: Union[pd.DataFrame, np.ndarray], pnl_column: str = 'pnl') -> float:
     """Calculate the win rate from a series of trades.
     
     Args:
-        trades: DataFrame containing trade data
+        trades: DataFrame containing trade data, or an array of per-trade P&L
         pnl_column: Name of the column containing P&L values
         
     Returns:
         Win rate as a decimal (0.0 to 1.0)
     """
-    if len(trades) == 0:
+    pnl = _trade_pnl(trades, pnl_column)
+    if pnl.size == 0:
         return 0.0
     
-    winning_trades = trades[trades[pnl_column] > 0]
-    return len(winning_trades) / len(trades)
+    return np.count_nonzero(pnl > 0) / pnl.size
 
-def calculate_profit_factor(trades: pd.DataFrame, pnl_column: str = 'pnl') -> float:
+def calculate_profit_factor(trades: Union[pd.DataFrame, np.ndarray], pnl_column: str = 'pnl') -> float:
     """Calculate the profit factor (gross profits / gross losses).
     
     Args:
-        trades: DataFrame containing trade data
+        trades: DataFrame containing trade data, or an array of per-trade P&L
         pnl_column: Name of the column containing P&L values
         
     Returns:
         Profit factor (1.0 means break-even, >1.0 means profitable)
     """
-    if len(trades) == 0:
+    pnl = _trade_pnl(trades, pnl_column)
+    if pnl.size == 0:
         return 0.0
     
-    gross_profit = trades[trades[pnl_column] > 0][pnl_column].sum()
-    gross_loss = abs(trades[trades[pnl_column] < 0][pnl_column].sum())
+    gross_profit = pnl[pnl > 0].sum()
+    gross_loss = -pnl[pnl < 0].sum()
     
     if gross_loss == 0:
         return float('inf')
@@ -238,7 +573,7 @@ def calculate_expected_return(returns: Union[pd.Series, np.ndarray]) -> float:
     """
     if len(returns) == 0:
         return 0.0
-    return np.mean(returns)
+    return _moments(returns).mean
 
 def calculate_value_at_risk(
     returns: Union[pd.Series, np.ndarray], 
@@ -255,7 +590,7 @@ def calculate_value_at_risk(
     """
     if len(returns) == 0:
         return 0.0
-    return np.percentile(returns, (1 - confidence_level) * 100)
+    return _var_cvar(returns, confidence_level)[0]
 
 def calculate_conditional_value_at_risk(
     returns: Union[pd.Series, np.ndarray], 
@@ -272,9 +607,7 @@ def calculate_conditional_value_at_risk(
     """
     if len(returns) == 0:
         return 0.0
-    
-    var = calculate_value_at_risk(returns, confidence_level)
-    return np.mean(returns[returns <= var])
+    return _var_cvar(returns, confidence_level)[1]
 
 def calculate_beta(
     asset_returns: Union[pd.Series, np.ndarray],
@@ -292,11 +625,7 @@ def calculate_beta(
     if len(asset_returns) != len(benchmark_returns) or len(asset_returns) < 2:
         return 0.0
     
-    # Calculate covariance and variance
-    cov_matrix = np.cov(asset_returns, benchmark_returns)
-    beta = cov_matrix[0, 1] / cov_matrix[1, 1]
-    
-    return beta
+    return _beta_and_means(asset_returns, benchmark_returns)[0]
 
 def calculate_alpha(
     asset_returns: Union[pd.Series, np.ndarray],
@@ -318,12 +647,10 @@ def calculate_alpha(
     if len(asset_returns) != len(benchmark_returns) or len(asset_returns) < 2:
         return 0.0
     
-    # Calculate beta first
-    beta = calculate_beta(asset_returns, benchmark_returns)
-    
-    # Calculate average returns
-    asset_avg_return = np.mean(asset_returns) * periods_per_year
-    benchmark_avg_return = np.mean(benchmark_returns) * periods_per_year
+    # Beta and average returns from the same pass over the data
+    beta, asset_mean, benchmark_mean = _beta_and_means(asset_returns, benchmark_returns)
+    asset_avg_return = asset_mean * periods_per_year
+    benchmark_avg_return = benchmark_mean * periods_per_year
     
     # Calculate alpha (annualized)
     alpha = (asset_avg_return - risk_free_rate) - beta * (benchmark_avg_return - risk_free_rate)
@@ -348,8 +675,8 @@ def calculate_tracking_error(
     if len(asset_returns) != len(benchmark_returns) or len(asset_returns) < 2:
         return 0.0
     
-    active_returns = asset_returns - benchmark_returns
-    tracking_error = np.std(active_returns, ddof=1) * np.sqrt(periods_per_year)
+    _, var, _ = _active_moments(asset_returns, benchmark_returns)
+    tracking_error = np.sqrt(var) * np.sqrt(periods_per_year)
     
     return tracking_error
 
@@ -371,16 +698,338 @@ def calculate_information_ratio(
     if len(asset_returns) != len(benchmark_returns) or len(asset_returns) < 2:
         return 0.0
     
-    # Calculate active returns
-    active_returns = asset_returns - benchmark_returns
+    # Mean and spread of the active returns from one pass
+    mean, var, _ = _active_moments(asset_returns, benchmark_returns)
     
     # Calculate average active return (annualized)
-    avg_active_return = np.mean(active_returns) * periods_per_year
+    avg_active_return = mean * periods_per_year
     
     # Calculate tracking error (annualized)
-    tracking_error = calculate_tracking_error(asset_returns, benchmark_returns, periods_per_year)
+    tracking_error = np.sqrt(var) * np.sqrt(periods_per_year)
     
     if tracking_error == 0:
         return 0.0
     
     return avg_active_return / tracking_error
+
+def compute_all_metrics(
+    returns: Union[pd.Series, np.ndarray],
+    prices: Optional[Union[pd.Series, np.ndarray]] = None,
+    trades: Optional[Union[pd.DataFrame, np.ndarray]] = None,
+    risk_free_rate: float = 0.0,
+    periods_per_year: int = 252,
+    confidence_level: float = 0.95,
+    pnl_column: str = 'pnl'
+) -> Dict[str, float]:
+    """Calculate the standard set of metrics together, reading each input once.
+    
+    The return statistics (annualized return and volatility, Sharpe, Sortino,
+    expected return) all come from a single _return_moments pass, drawdown from
+    one scan of the prices and VaR/CVaR from one partition, instead of each
+    metric function converting and re-reducing the same data. Values match the
+    individual calculate_* functions.
+    
+    Args:
+        returns: Series or array of returns
+        prices: Series or array of prices for drawdown; if None, drawdown is
+                measured on the equity curve compounded from `returns`
+        trades: DataFrame of trades (or array of per-trade P&L) for win rate
+                and profit factor; those keys are omitted when None
+        risk_free_rate: Annual risk-free rate
+        periods_per_year: Number of periods per year
+        confidence_level: Confidence level for VaR and CVaR
+        pnl_column: Name of the column containing P&L values in `trades`
+        
+    Returns:
+        Dictionary of metric name to value
+    """
+    n_periods = len(returns)
+    shift = risk_free_rate / periods_per_year
+    m = _moments(returns, shift)
+    
+    if prices is None:
+        prices = np.cumprod(1.0 + _asarray(returns))
+    max_drawdown = calculate_max_drawdown(prices)
+    var, cvar = _var_cvar(returns, confidence_level) if n_periods > 0 else (0.0, 0.0)
+    
+    annualized_return = 0.0
+    if n_periods > 0:
+        annualized_return = m.growth - 1
+        if n_periods >= periods_per_year:
+            annualized_return = m.growth ** (periods_per_year / n_periods) - 1
+    
+    volatility = sharpe = sortino = calmar = 0.0
+    if n_periods >= 2:
+        vol_per_period = np.sqrt(m.var)
+        volatility = vol_per_period * np.sqrt(periods_per_year)
+        sharpe = (m.mean / vol_per_period) * np.sqrt(periods_per_year) if vol_per_period != 0 else 0.0
+        
+        downside_dev = np.sqrt(m.down_var)
+        if m.n_down == 0 or downside_dev == 0:
+            sortino = float('inf')
+        else:
+            sortino = (m.mean / downside_dev) * np.sqrt(periods_per_year)
+        
+        calmar = annualized_return / abs(max_drawdown) if max_drawdown != 0 else float('inf')
+    
+    metrics = {
+        'annualized_return': annualized_return,
+        'annualized_volatility': volatility,
+        'sharpe_ratio': sharpe,
+        'sortino_ratio': sortino,
+        'max_drawdown': max_drawdown,
+        'calmar_ratio': calmar,
+        'expected_return': m.mean + shift if n_periods > 0 else 0.0,
+        'value_at_risk': var,
+        'conditional_value_at_risk': cvar,
+    }
+    
+    if trades is not None:
+        metrics['win_rate'] = calculate_win_rate(trades, pnl_column)
+        metrics['profit_factor'] = calculate_profit_factor(trades, pnl_column)
+    
+    return metrics
+
+def rolling_sharpe(
+    returns: Union[pd.Series, np.ndarray],
+    window: int,
+    risk_free_rate: float = 0.0,
+    periods_per_year: int = 252
+) -> Union[pd.Series, np.ndarray]:
+    """Calculate the Sharpe ratio over every trailing window of returns.
+    
+    Window sums come from prefix sums, so the cost is O(n) whatever the window
+    length, instead of O(n * window) for calling calculate_sharpe_ratio per window.
+    
+    Args:
+        returns: Series or array of returns
+        window: Number of periods per window (at least 2)
+        risk_free_rate: Annual risk-free rate (default: 0.0)
+        periods_per_year: Number of periods per year
+        
+    Returns:
+        Annualized Sharpe ratio for each period, NaN until the first full window
+        (a Series on the same index for Series input)
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2")
+    
+    r = _asarray(returns)
+    if r.size < window:
+        return _like_input(np.full(r.size, np.nan), returns)
+    
+    mean, var = _rolling_moments(r, window)
+    vol = np.sqrt(var)
+    excess = mean - risk_free_rate / periods_per_year
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(vol == 0, 0.0, excess / vol) * np.sqrt(periods_per_year)
+    return _like_input(sharpe, returns)
+
+def rolling_volatility(
+    returns: Union[pd.Series, np.ndarray],
+    window: int,
+    periods_per_year: int = 252
+) -> Union[pd.Series, np.ndarray]:
+    """Calculate annualized volatility over every trailing window of returns.
+    
+    Args:
+        returns: Series or array of returns
+        window: Number of periods per window (at least 2)
+        periods_per_year: Number of periods per year
+        
+    Returns:
+        Annualized volatility for each period, NaN until the first full window
+        (a Series on the same index for Series input)
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2")
+    
+    r = _asarray(returns)
+    if r.size < window:
+        return _like_input(np.full(r.size, np.nan), returns)
+    
+    _, var = _rolling_moments(r, window)
+    return _like_input(np.sqrt(var) * np.sqrt(periods_per_year), returns)
+
+def rolling_max_drawdown(
+    prices: Union[pd.Series, np.ndarray],
+    window: int
+) -> Union[pd.Series, np.ndarray]:
+    """Calculate the maximum drawdown within every trailing window of prices.
+    
+    Each value equals calculate_max_drawdown on that window alone (peaks
+    before the window don't count), computed for all windows in O(n).
+    
+    Args:
+        prices: Series or array of prices
+        window: Number of periods per window (at least 1)
+        
+    Returns:
+        Maximum drawdown (negative decimal) for each period, NaN until the
+        first full window (a Series on the same index for Series input)
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    
+    return _like_input(_rolling_max_drawdown(_asarray(prices), window), prices)
+
+class StreamingMetrics:
+    """Sharpe, Sortino and max drawdown of a live return stream, updated in O(1) per return.
+    
+    Instead of recomputing every statistic over the full history on each tick,
+    the class keeps running moments of the excess returns and of their negative
+    values (Welford's update, which stays exact for constant streams) and the
+    peak, trough and worst drawdown of the price curve. Statistics match
+    calculate_sharpe_ratio, calculate_sortino_ratio and calculate_max_drawdown
+    on the same history.
+    
+    Independent consecutive segments can be tracked separately and combined
+    with merge(). StreamingMetricsJit is the same class compiled as a Numba
+    jitclass, for updating from inside other njit loops.
+    """
+    
+    __slots__ = (
+        'risk_free_rate', 'periods_per_year', 'priced',
+        'n', 'mean', 'm2', 'n_down', 'mean_down', 'm2_down',
+        'equity', 'peak', 'trough', 'worst_dd',
+    )
+    
+    def __init__(self, risk_free_rate: float = 0.0, periods_per_year: float = 252.0):
+        """Initialize an empty stream.
+        
+        Args:
+            risk_free_rate: Annual risk-free rate (default: 0.0)
+            periods_per_year: Number of periods per year
+        """
+        self.risk_free_rate = risk_free_rate
+        self.periods_per_year = periods_per_year
+        self.priced = False
+        
+        self.n = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.n_down = 0.0
+        self.mean_down = 0.0
+        self.m2_down = 0.0
+        
+        self.equity = 1.0
+        self.peak = -np.inf
+        self.trough = np.inf
+        self.worst_dd = 0.0
+    
+    def update(self, r: float, price: float = np.nan) -> None:
+        """Add the return of one period.
+        
+        Args:
+            r: Return of the period as a decimal
+            price: Price at the end of the period, for drawdown; when omitted,
+                   drawdown is measured on the equity curve compounded from the
+                   returns (use one or the other consistently)
+        """
+        x = r - self.risk_free_rate / self.periods_per_year
+        self.n += 1.0
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < 0:
+            self.n_down += 1.0
+            delta = x - self.mean_down
+            self.mean_down += delta / self.n_down
+            self.m2_down += delta * (x - self.mean_down)
+        
+        self.equity *= 1.0 + r
+        if math.isnan(price):
+            price = self.equity
+        else:
+            self.priced = True
+        self.peak, self.trough, self.worst_dd = _combine_drawdown(
+            self.peak, self.trough, self.worst_dd, price, price, 0.0
+        )
+    
+    def merge(self, other) -> None:
+        """Fold in the statistics of the segment that immediately follows this one.
+        
+        Moments combine with Chan et al.'s pairwise formula; the drawdown
+        summaries combine like adjacent price segments. A segment tracked on
+        compounded equity is rescaled to this segment's final equity first.
+        
+        Args:
+            other: Metrics of the following segment, with the same settings
+        """
+        n = self.n + other.n
+        if other.n > 0:
+            delta = other.mean - self.mean
+            self.m2 += other.m2 + delta * delta * self.n * other.n / n
+            self.mean += delta * other.n / n
+        self.n = n
+        
+        n_down = self.n_down + other.n_down
+        if other.n_down > 0:
+            delta = other.mean_down - self.mean_down
+            self.m2_down += other.m2_down + delta * delta * self.n_down * other.n_down / n_down
+            self.mean_down += delta * other.n_down / n_down
+        self.n_down = n_down
+        
+        scale = 1.0 if other.priced else self.equity
+        self.peak, self.trough, self.worst_dd = _combine_drawdown(
+            self.peak, self.trough, self.worst_dd,
+            other.peak * scale, other.trough * scale, other.worst_dd
+        )
+        self.equity *= other.equity
+        self.priced = self.priced or other.priced
+    
+    @property
+    def count(self) -> float:
+        """Number of returns seen."""
+        return self.n
+    
+    @property
+    def volatility(self) -> float:
+        """Annualized volatility of the returns so far."""
+        if self.n < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.n - 1) * self.periods_per_year)
+    
+    @property
+    def sharpe(self) -> float:
+        """Annualized Sharpe ratio of the returns so far."""
+        if self.n < 2:
+            return 0.0
+        vol = math.sqrt(self.m2 / (self.n - 1))
+        if vol == 0:
+            return 0.0
+        return (self.mean / vol) * math.sqrt(self.periods_per_year)
+    
+    @property
+    def sortino(self) -> float:
+        """Annualized Sortino ratio of the returns so far."""
+        if self.n < 2:
+            return 0.0
+        if self.n_down == 0:
+            return np.inf
+        if self.n_down < 2:
+            return np.nan
+        downside_dev = math.sqrt(self.m2_down / (self.n_down - 1))
+        if downside_dev == 0:
+            return np.inf
+        return (self.mean / downside_dev) * math.sqrt(self.periods_per_year)
+    
+    @property
+    def max_drawdown(self) -> float:
+        """Worst drawdown so far as a negative decimal."""
+        return self.worst_dd
+
+def _without_slots(cls: Type[Any]) -> type:
+    """Copy of a __slots__ class as a plain class, which jitclass can compile."""
+    body = {
+        name: value for name, value in vars(cls).items()
+        if name != '__slots__' and name not in cls.__slots__
+    }
+    return type(cls.__name__ + 'Jit', (), body)
+
+_STREAMING_SPEC = [
+    (name, numba_types.boolean if name == 'priced' else numba_types.float64)
+    for name in StreamingMetrics.__slots__
+] if NUMBA_AVAILABLE else []
+
+StreamingMetricsJit = jitclass(_STREAMING_SPEC)(_without_slots(StreamingMetrics))
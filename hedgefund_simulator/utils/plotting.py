@@ -1,21 +1,332 @@
-"""Utility functions for plotting financial data and backtest results."""
+"""Utility functions for plotting financial data and backtest results.
+
+Matplotlib and seaborn are imported inside the plot functions, so importing
+this module (and the utils package) does not pay their start-up cost until a
+chart is actually drawn.
+"""
+
+from __future__ import annotations
+
+import pickle
 
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple, Union
-import seaborn as sns
-from matplotlib.gridspec import GridSpec
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+from . import performance_metrics
+from ._njit import NUMBA_AVAILABLE, njit
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+    TSDOWNSAMPLE_AVAILABLE = True
+except ImportError:
+    TSDOWNSAMPLE_AVAILABLE = False
+
+# Whether the plot style has been applied (see _ensure_style)
+_STYLE_SET = False
+
+def _ensure_style() -> None:
+    """Apply the plot style and palette on the first plot instead of at import."""
+    global _STYLE_SET
+    if _STYLE_SET:
+        return
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    try:
+        plt.style.use('seaborn-v0_8')
+    except OSError:
+        # Matplotlib < 3.6 only knows the old style name
+        plt.style.use('seaborn')
+    sns.set_palette("husl")
+    _STYLE_SET = True
+
+# Default number of points drawn per line, roughly the pixel width of a figure
+DEFAULT_MAX_POINTS = 2000
+
+def _minmax_indices(values: np.ndarray, n_out: int) -> np.ndarray:
+    """Positions of the minimum and maximum of `values` in n_out // 2 equal buckets."""
+    n = len(values)
+    n_bins = max(n_out // 2, 1)
+    size = -(-n // n_bins)
+    n_bins = -(-n // size)
+    
+    padded = np.full(n_bins * size, np.nan)
+    padded[:n] = values
+    bins = padded.reshape(n_bins, size)
+    
+    offsets = np.arange(n_bins) * size
+    lo = offsets + np.argmin(np.where(np.isnan(bins), np.inf, bins), axis=1)
+    hi = offsets + np.argmax(np.where(np.isnan(bins), -np.inf, bins), axis=1)
+    return np.unique(np.concatenate(([0, n - 1], lo, hi)))
+
+def _downsample(series: pd.Series, n_out: Optional[int]) -> pd.Series:
+    """Reduce `series` to about `n_out` points while keeping its visual peaks and troughs.
+    
+    Uses MinMaxLTTB from tsdownsample when installed and per-bucket min/max
+    selection otherwise. NaN points are dropped, which Matplotlib would not
+    draw anyway.
+    
+    Args:
+        series: Series to plot
+        n_out: Target number of points; None or a value not smaller than the
+               series length returns the series unchanged
+        
+    Returns:
+        Series with the selected points
+    """
+    if n_out is None or len(series) <= n_out:
+        return series
+    
+    # Point selection only needs display precision
+    values = series.to_numpy(dtype=np.float32)
+    valid = np.flatnonzero(np.isfinite(values))
+    if len(valid) <= n_out:
+        return series.iloc[valid]
+    
+    values = values[valid]
+    if TSDOWNSAMPLE_AVAILABLE and n_out >= 3:
+        if isinstance(series.index, pd.DatetimeIndex):
+            x = series.index.values.astype('int64')[valid]
+            selected = MinMaxLTTBDownsampler().downsample(x, values, n_out=n_out)
+        else:
+            selected = MinMaxLTTBDownsampler().downsample(values, n_out=n_out)
+    else:
+        selected = _minmax_indices(values, n_out)
+    return series.iloc[valid[selected]]
+
+# Month columns of the monthly returns matrix. Fixed labels instead of
+# month_name() keep them independent of the locale; an Index is immutable, so
+# every matrix can share this one.
+_MONTH_COLUMNS = pd.Index(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                           'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], name='Month')
+
+def _monthly_returns_matrix(returns: pd.Series) -> pd.DataFrame:
+    """Compounded monthly returns as a Year x month matrix.
+    
+    Monthly compounding sums log(1 + r) per (year, month) bucket and maps the
+    sums back with expm1, so there is no per-group Python call and no pivot.
+    
+    Args:
+        returns: Series with return data (must have DateTimeIndex)
+        
+    Returns:
+        DataFrame indexed by year with Jan..Dec columns; months without data are NaN
+    """
+    # Months since 1970 straight from the datetime64 values (wall time for
+    # tz-aware indexes), counted from January of the first year
+    index = returns.index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    months = index.to_numpy().astype('datetime64[M]').astype(np.int64)
+    first_month = (months.min() // 12) * 12 if len(months) else 0
+    first_year = 1970 + first_month // 12
+    buckets = months - first_month
+    
+    log_returns = np.log1p(returns.to_numpy(dtype=np.float64))
+    observed = ~np.isnan(log_returns)
+    n_buckets = int(buckets.max()) + 1 if len(buckets) else 0
+    sums = np.bincount(buckets[observed], weights=log_returns[observed], minlength=n_buckets)
+    counts = np.bincount(buckets[observed], minlength=n_buckets)
+    
+    n_years = -(-n_buckets // 12)
+    flat = np.full(n_years * 12, np.nan)
+    flat[:n_buckets] = np.where(counts > 0, np.expm1(sums), np.nan)
+    monthly = flat.reshape(n_years, 12)
+    
+    # Like a pivot table, only keep years with at least one observation
+    has_data = ~np.isnan(monthly).all(axis=1)
+    return pd.DataFrame(
+        monthly[has_data],
+        index=pd.Index(first_year + np.flatnonzero(has_data), name='Year'),
+        columns=_MONTH_COLUMNS
+    )
+
+# Heatmaps with more cells than this are drawn without value labels by default
+_MAX_ANNOTATED_CELLS = 200
+
+def _relative_luminance(rgba: np.ndarray) -> np.ndarray:
+    """Relative luminance of RGBA colors (rows), as used to pick annotation colors."""
+    rgb = rgba[..., :3]
+    rgb = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return rgb @ np.array([0.2126, 0.7152, 0.0722])
 
-# Set style
-plt.style.use('seaborn')
-sns.set_palette("husl")
+def _annotated_heatmap(
+    ax: plt.Axes,
+    matrix: pd.DataFrame,
+    fmt: str,
+    cmap: str,
+    mask: Optional[np.ndarray] = None,
+    linewidths: float = 0.0,
+    square: bool = False,
+    cax: Optional[plt.Axes] = None,
+    annot: Optional[bool] = None
+):
+    """Draw an annotated heatmap centred on zero, like sns.heatmap(center=0, annot=True).
+    
+    The cells are a single image, and the labels are formatted in one vectorized
+    call and only created for visible cells.
+    
+    Args:
+        ax: Axes to draw on
+        matrix: Values to show; NaN cells are left blank
+        fmt: Format of the cell labels, e.g. ".1f"
+        cmap: Colormap name
+        mask: Optional boolean array, True for cells to hide
+        linewidths: Width of the white lines between cells
+        square: Whether cells should be square
+        cax: Axes for the colorbar (default: space taken from `ax`)
+        annot: Whether to label the cells with their values (default: only
+               when the matrix has at most _MAX_ANNOTATED_CELLS cells)
+        
+    Returns:
+        The AxesImage of the heatmap
+    """
+    from matplotlib.colors import Normalize
+    
+    values = matrix.to_numpy(dtype=np.float64)
+    hidden = np.isnan(values)
+    if mask is not None:
+        hidden |= mask
+    
+    # Symmetric color range around zero
+    limit = np.nanmax(np.abs(np.where(hidden, np.nan, values))) if not hidden.all() else 0.0
+    norm = Normalize(vmin=-limit, vmax=limit) if limit > 0 else Normalize(vmin=-1.0, vmax=1.0)
+    
+    image = ax.imshow(
+        np.ma.masked_array(values, mask=hidden),
+        cmap=cmap,
+        norm=norm,
+        aspect='equal' if square else 'auto',
+        interpolation='nearest'
+    )
+    if cax is not None:
+        ax.figure.colorbar(image, cax=cax)
+    else:
+        ax.figure.colorbar(image, ax=ax)
+    
+    # Tick labels once per axis, axis labels from the index/column names
+    n_rows, n_cols = values.shape
+    ax.set_xticks(np.arange(n_cols))
+    ax.set_xticklabels(matrix.columns.astype(str))
+    ax.set_yticks(np.arange(n_rows))
+    ax.set_yticklabels(matrix.index.astype(str), rotation=0)
+    ax.set_xlabel(matrix.columns.name or '')
+    ax.set_ylabel(matrix.index.name or '')
+    ax.tick_params(length=0)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    
+    if linewidths > 0:
+        ax.set_xticks(np.arange(n_cols + 1) - 0.5, minor=True)
+        ax.set_yticks(np.arange(n_rows + 1) - 0.5, minor=True)
+        ax.grid(which='minor', color='white', linewidth=linewidths)
+        ax.grid(which='major', visible=False)
+        ax.tick_params(which='minor', length=0)
+    
+    if annot is None:
+        annot = values.size <= _MAX_ANNOTATED_CELLS
+    
+    # Labels: dark on light cells and white on dark cells
+    cells = np.argwhere(~hidden)
+    if annot and len(cells):
+        shown = values[cells[:, 0], cells[:, 1]]
+        labels = np.char.mod('%' + fmt, shown)
+        light = _relative_luminance(image.cmap(norm(shown))) > 0.408
+        for (row, col), label, is_light in zip(cells, labels, light):
+            ax.text(col, row, label, ha='center', va='center', color='.15' if is_light else 'w')
+    
+    return image
+
+def _kde_curve(
+    values: np.ndarray,
+    lo: float,
+    hi: float,
+    gridsize: int = 200
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Gaussian KDE of `values` on an even grid over [lo, hi], using Scott's bandwidth.
+    
+    The sample is linearly binned onto the grid and the bins are convolved with
+    the kernel, so the cost is O(n + gridsize**2) instead of O(n * gridsize) for
+    evaluating every kernel at every grid point.
+        
+    Returns:
+        (grid, density), or None when the sample has fewer than two distinct values
+    """
+    n = len(values)
+    if n < 2 or hi <= lo:
+        return None
+    bandwidth = np.std(values, ddof=1) * n ** (-1 / 5)
+    if bandwidth == 0:
+        return None
+    
+    grid = np.linspace(lo, hi, gridsize)
+    step = grid[1] - grid[0]
+    
+    # Split each point's weight between its two neighbouring grid points
+    position = (values - lo) / step
+    left = np.clip(np.floor(position).astype(np.int64), 0, gridsize - 2)
+    frac = position - left
+    weights = (np.bincount(left, weights=1.0 - frac, minlength=gridsize)
+               + np.bincount(left + 1, weights=frac, minlength=gridsize))
+    
+    offsets = np.arange(-(gridsize - 1), gridsize) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = np.convolve(weights, kernel)[gridsize - 1:2 * gridsize - 1] / n
+    return grid, density
+
+def _histogram_with_kde(ax: plt.Axes, values: np.ndarray, bins: int = 30) -> None:
+    """Histogram of the finite `values` with a KDE line scaled to the counts, like sns.histplot(kde=True)."""
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return
+    
+    counts, edges = np.histogram(values, bins=bins)
+    bars = ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.6, edgecolor='white')
+    
+    kde = _kde_curve(values, edges[0], edges[-1])
+    if kde is not None:
+        grid, density = kde
+        color = bars.patches[0].get_facecolor()[:3]
+        ax.plot(grid, density * len(values) * (edges[1] - edges[0]), color=color)
+
+def _drawdown_array(equity_curve: pd.Series) -> np.ndarray:
+    """Drawdown from the running peak in percent, computed on the raw values.
+    
+    NaN values are skipped when tracking the peak (as Series.cummax does) and
+    stay NaN in the result. The result is float32, which is ample for plotting
+    and halves the memory traffic on long curves.
+    """
+    values = equity_curve.to_numpy(dtype=np.float32)
+    running_max = np.fmax.accumulate(values)
+    return (values - running_max) / running_max * 100.0
+
+def _draw_equity(
+    ax: plt.Axes,
+    equity_curve: pd.Series,
+    benchmark: Optional[pd.Series] = None,
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
+) -> None:
+    """Draw the equity curve (and benchmark) with legend and grid on `ax`."""
+    equity_curve = _downsample(equity_curve, max_points)
+    ax.plot(equity_curve.index, equity_curve, label='Strategy', linewidth=2, rasterized=True)
+    
+    if benchmark is not None:
+        benchmark = _downsample(benchmark, max_points)
+        ax.plot(benchmark.index, benchmark, label='Benchmark', linestyle='--', alpha=0.7, rasterized=True)
+    
+    ax.legend()
+    ax.grid(True, alpha=0.3)
 
 def plot_equity_curve(
     equity_curve: pd.Series,
     benchmark: Optional[pd.Series] = None,
     title: str = "Equity Curve",
-    figsize: Tuple[int, int] = (12, 6)
+    figsize: Tuple[int, int] = (12, 6),
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
 ) -> plt.Figure:
     """Plot equity curve with optional benchmark comparison.
     
@@ -24,36 +335,85 @@ def plot_equity_curve(
         benchmark: Optional benchmark series for comparison
         title: Plot title
         figsize: Figure size (width, height)
+        max_points: Maximum number of points drawn per line (None draws every point)
         
     Returns:
         Matplotlib Figure object
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    import matplotlib.pyplot as plt
+    _ensure_style()
     
-    # Plot equity curve
-    ax.plot(equity_curve.index, equity_curve, label='Strategy', linewidth=2)
+    fig, ax = plt.subplots(figsize=figsize, layout='constrained')
     
-    # Plot benchmark if provided
-    if benchmark is not None:
-        ax.plot(benchmark.index, benchmark, label='Benchmark', linestyle='--', alpha=0.7)
+    # Plot equity curve and benchmark if provided
+    _draw_equity(ax, equity_curve, benchmark, max_points)
     
     # Formatting
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.set_xlabel('Date')
     ax.set_ylabel('Portfolio Value')
-    ax.legend()
-    ax.grid(True, alpha=0.3)
     
     # Rotate x-axis labels for better readability
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    fig.autofmt_xdate(rotation=45, ha='right')
     
     return fig
 
+def render_variants(
+    variants: Sequence[pd.Series],
+    benchmark: Optional[pd.Series] = None,
+    titles: Optional[Sequence[str]] = None,
+    figsize: Tuple[int, int] = (12, 6),
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
+) -> List[plt.Figure]:
+    """Plot one equity curve figure per variant, e.g. for a parameter sweep.
+    
+    The first figure is built with plot_equity_curve and pickled; every other
+    figure is a copy of it with only the strategy line's data replaced, which
+    skips rebuilding the axes, ticks, legend and layout for each variant.
+    
+    Args:
+        variants: Equity curve of each variant
+        benchmark: Optional benchmark series, shared by all figures
+        titles: Optional title of each figure (default: "Equity Curve")
+        figsize: Figure size (width, height)
+        max_points: Maximum number of points drawn per line (None draws every point)
+        
+    Returns:
+        List of Matplotlib Figure objects, one per variant
+    """
+    if not variants:
+        return []
+    
+    template = plot_equity_curve(variants[0], benchmark, figsize=figsize, max_points=max_points)
+    blob = pickle.dumps(template)
+    
+    figures = [template]
+    for equity_curve in variants[1:]:
+        fig = pickle.loads(blob)
+        ax = fig.axes[0]
+        equity_curve = _downsample(equity_curve, max_points)
+        ax.lines[0].set_data(equity_curve.index, equity_curve.to_numpy())
+        ax.relim()
+        ax.autoscale_view()
+        figures.append(fig)
+    
+    if titles is not None:
+        for fig, title in zip(figures, titles):
+            fig.axes[0].set_title(title, fontsize=14, fontweight='bold')
+    return figures
+
+def _draw_drawdown(ax: plt.Axes, equity_curve: pd.Series, max_points: Optional[int] = DEFAULT_MAX_POINTS) -> None:
+    """Draw the drawdown (%) of `equity_curve` as a filled area with grid on `ax`."""
+    drawdown = pd.Series(_drawdown_array(equity_curve), index=equity_curve.index)
+    drawdown = _downsample(drawdown, max_points)
+    ax.fill_between(drawdown.index, drawdown, 0, color='red', alpha=0.3, rasterized=True)
+    ax.grid(True, alpha=0.3)
+
 def plot_drawdown(
     equity_curve: pd.Series,
     title: str = "Drawdown",
-    figsize: Tuple[int, int] = (12, 4)
+    figsize: Tuple[int, int] = (12, 4),
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
 ) -> plt.Figure:
     """Plot drawdown from equity curve.
     
@@ -61,32 +421,40 @@ def plot_drawdown(
         equity_curve: Series with equity curve data
         title: Plot title
         figsize: Figure size (width, height)
+        max_points: Maximum number of points drawn (None draws every point)
         
     Returns:
         Matplotlib Figure object
     """
-    # Calculate drawdown
-    rolling_max = equity_curve.cummax()
-    drawdown = (equity_curve - rolling_max) / rolling_max * 100
+    import matplotlib.pyplot as plt
+    _ensure_style()
     
     # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = plt.subplots(figsize=figsize, layout='constrained')
     
     # Plot drawdown
-    ax.fill_between(drawdown.index, drawdown, 0, color='red', alpha=0.3)
+    _draw_drawdown(ax, equity_curve, max_points)
     
     # Formatting
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.set_xlabel('Date')
     ax.set_ylabel('Drawdown (%)')
-    ax.grid(True, alpha=0.3)
     
     # Rotate x-axis labels for better readability
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    fig.autofmt_xdate(rotation=45, ha='right')
     
     return fig
 
+def _draw_monthly_heatmap(
+    ax: plt.Axes,
+    monthly: pd.DataFrame,
+    linewidths: float = 0.5,
+    cax: Optional[plt.Axes] = None
+) -> None:
+    """Draw a _monthly_returns_matrix result as an annotated heatmap (%) on `ax`, colorbar on `cax` if given."""
+    monthly_returns = monthly * 100  # Convert to percentage
+    _annotated_heatmap(ax, monthly_returns, fmt=".1f", cmap='RdYlGn', linewidths=linewidths, cax=cax)
+
 def plot_monthly_returns_heatmap(
     returns: pd.Series,
     title: str = "Monthly Returns (%)",
@@ -102,44 +470,33 @@ def plot_monthly_returns_heatmap(
     Returns:
         Matplotlib Figure object
     """
-    # Convert to DataFrame and extract month/year
-    returns_df = returns.to_frame('Returns')
-    returns_df['Year'] = returns_df.index.year
-    returns_df['Month'] = returns_df.index.month_name().str[:3]
-    
-    # Pivot for heatmap
-    monthly_returns = returns_df.pivot_table(
-        index='Year', 
-        columns='Month', 
-        values='Returns', 
-        aggfunc=lambda x: (1 + x).prod() - 1
-    ) * 100  # Convert to percentage
-    
-    # Reorder columns to be Jan-Dec
-    month_order = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                  'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    monthly_returns = monthly_returns[month_order]
+    import matplotlib.pyplot as plt
+    _ensure_style()
     
     # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = plt.subplots(figsize=figsize, layout='constrained')
     
     # Create heatmap
-    sns.heatmap(
-        monthly_returns, 
-        annot=True, 
-        fmt=".1f", 
-        cmap='RdYlGn', 
-        center=0,
-        linewidths=0.5,
-        ax=ax
-    )
+    _draw_monthly_heatmap(ax, _monthly_returns_matrix(returns))
     
     # Formatting
     ax.set_title(title, fontsize=14, fontweight='bold')
-    plt.tight_layout()
     
     return fig
 
+def _draw_returns_dist(ax: plt.Axes, returns: pd.Series) -> None:
+    """Draw the histogram and KDE of returns (%) with mean/median lines, legend and grid on `ax`."""
+    _histogram_with_kde(ax, returns.to_numpy(dtype=np.float32) * 100, bins=30)
+    
+    # Add mean and median lines
+    mean = returns.mean() * 100
+    median = returns.median() * 100
+    
+    ax.axvline(mean, color='r', linestyle='--', label=f'Mean: {mean:.2f}%')
+    ax.axvline(median, color='g', linestyle='-', label=f'Median: {median:.2f}%')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
 def plot_returns_distribution(
     returns: pd.Series,
     title: str = "Returns Distribution",
@@ -155,34 +512,44 @@ def plot_returns_distribution(
     Returns:
         Matplotlib Figure object
     """
-    fig, ax = plt.subplots(figsize=figsize)
-    
-    # Plot histogram
-    sns.histplot(returns * 100, kde=True, bins=30, ax=ax)
+    import matplotlib.pyplot as plt
+    _ensure_style()
     
-    # Add mean and median lines
-    mean = returns.mean() * 100
-    median = returns.median() * 100
+    fig, ax = plt.subplots(figsize=figsize, layout='constrained')
     
-    ax.axvline(mean, color='r', linestyle='--', label=f'Mean: {mean:.2f}%')
-    ax.axvline(median, color='g', linestyle='-', label=f'Median: {median:.2f}%')
+    # Plot histogram with mean and median lines
+    _draw_returns_dist(ax, returns)
     
     # Formatting
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.set_xlabel('Daily Return (%)')
     ax.set_ylabel('Frequency')
-    ax.legend()
-    ax.grid(True, alpha=0.3)
     
-    plt.tight_layout()
     return fig
 
+def _draw_rolling_sharpe(
+    ax: plt.Axes,
+    returns: pd.Series,
+    window: int,
+    risk_free_rate: float = 0.0,
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
+) -> None:
+    """Draw the annualized rolling Sharpe ratio with a zero line and grid on `ax`."""
+    # Calculate rolling Sharpe ratio (annualized) in a single O(n) pass
+    rolling_sharpe = performance_metrics.rolling_sharpe(returns, window, risk_free_rate)
+    rolling_sharpe = _downsample(rolling_sharpe, max_points)
+    
+    ax.plot(rolling_sharpe.index, rolling_sharpe, label='Rolling Sharpe')
+    ax.axhline(0, color='black', linestyle='-', alpha=0.3)
+    ax.grid(True, alpha=0.3)
+
 def plot_rolling_sharpe(
     returns: pd.Series,
     risk_free_rate: float = 0.0,
     window: int = 63,  # 3 months of daily data
     title: str = "Rolling Sharpe Ratio (6-Month)",
-    figsize: Tuple[int, int] = (12, 4)
+    figsize: Tuple[int, int] = (12, 4),
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
 ) -> plt.Figure:
     """Plot rolling Sharpe ratio.
     
@@ -192,44 +559,89 @@ def plot_rolling_sharpe(
         window: Rolling window in periods
         title: Plot title
         figsize: Figure size (width, height)
+        max_points: Maximum number of points drawn (None draws every point)
         
     Returns:
         Matplotlib Figure object
     """
-    # Calculate excess returns
-    excess_returns = returns - (risk_free_rate / 252)  # Daily risk-free rate
-    
-    # Calculate rolling Sharpe ratio (annualized)
-    rolling_sharpe = excess_returns.rolling(window=window).mean() / \
-                    excess_returns.rolling(window=window).std() * np.sqrt(252)
+    import matplotlib.pyplot as plt
+    _ensure_style()
     
     # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
-    
-    # Plot rolling Sharpe
-    ax.plot(rolling_sharpe.index, rolling_sharpe, label='Rolling Sharpe')
+    fig, ax = plt.subplots(figsize=figsize, layout='constrained')
     
-    # Add horizontal line at 0
-    ax.axhline(0, color='black', linestyle='-', alpha=0.3)
+    # Plot rolling Sharpe with a horizontal line at 0
+    _draw_rolling_sharpe(ax, returns, window, risk_free_rate, max_points)
     
     # Formatting
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.set_xlabel('Date')
     ax.set_ylabel('Sharpe Ratio')
     ax.legend()
-    ax.grid(True, alpha=0.3)
     
     # Rotate x-axis labels for better readability
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    fig.autofmt_xdate(rotation=45, ha='right')
     
     return fig
 
+# Trade action codes passed to _split_trades; other actions map to -1
+_TRADE_ACTIONS = pd.Index(['buy', 'sell'])
+
+@njit(
+    'Tuple((int64[:], float32[:], int64[:], float32[:]))'
+    '(Array(int8, 1, "A", readonly=True), Array(int64, 1, "A", readonly=True), '
+    'Array(float32, 1, "A", readonly=True))',
+    cache=True
+)
+def _split_trades_jit(
+    actions: np.ndarray,
+    dates: np.ndarray,
+    prices: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Dates (ns) and prices of the buys (action 0) and sells (action 1), in one pass."""
+    n = actions.shape[0]
+    buy_x = np.empty(n, dtype=np.int64)
+    buy_y = np.empty(n, dtype=np.float32)
+    sell_x = np.empty(n, dtype=np.int64)
+    sell_y = np.empty(n, dtype=np.float32)
+    n_buy = 0
+    n_sell = 0
+    
+    for i in range(n):
+        if actions[i] == 0:
+            buy_x[n_buy] = dates[i]
+            buy_y[n_buy] = prices[i]
+            n_buy += 1
+        elif actions[i] == 1:
+            sell_x[n_sell] = dates[i]
+            sell_y[n_sell] = prices[i]
+            n_sell += 1
+    
+    return buy_x[:n_buy], buy_y[:n_buy], sell_x[:n_sell], sell_y[:n_sell]
+
+def _split_trades_numpy(
+    actions: np.ndarray,
+    dates: np.ndarray,
+    prices: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """NumPy equivalent of _split_trades_jit, used when numba is not installed."""
+    is_buy = actions == 0
+    is_sell = actions == 1
+    return dates[is_buy], prices[is_buy], dates[is_sell], prices[is_sell]
+
+_split_trades: Callable[[np.ndarray, np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+if NUMBA_AVAILABLE:
+    _split_trades = _split_trades_jit
+else:
+    # Interpreting the loop above in Python would be far slower than two boolean masks
+    _split_trades = _split_trades_numpy
+
 def plot_trades(
     prices: pd.Series,
     trades: pd.DataFrame,
     title: str = "Trades",
-    figsize: Tuple[int, int] = (14, 8)
+    figsize: Tuple[int, int] = (14, 8),
+    max_points: Optional[int] = DEFAULT_MAX_POINTS
 ) -> plt.Figure:
     """Plot price chart with buy/sell markers.
     
@@ -238,40 +650,51 @@ def plot_trades(
         trades: DataFrame with trade information (must have 'date', 'action', 'price' columns)
         title: Plot title
         figsize: Figure size (width, height)
+        max_points: Maximum number of points drawn for the price line (None
+                    draws every point); trade markers are always all drawn
         
     Returns:
         Matplotlib Figure object
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    import matplotlib.pyplot as plt
+    _ensure_style()
+    
+    fig, ax = plt.subplots(figsize=figsize, layout='constrained')
     
     # Plot price
-    ax.plot(prices.index, prices, label='Price', linewidth=2, alpha=0.7)
+    prices = _downsample(prices, max_points)
+    ax.plot(prices.index, prices, label='Price', linewidth=2, alpha=0.7, rasterized=True)
     
     # Plot trades
     if not trades.empty:
-        buy_trades = trades[trades['action'] == 'buy']
-        sell_trades = trades[trades['action'] == 'sell']
+        # Split buys and sells in one pass over raw arrays, so scatter gets no pandas objects
+        actions = _TRADE_ACTIONS.get_indexer(trades['action']).astype(np.int8)
+        dates = trades['date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        trade_prices = trades['price'].to_numpy(dtype=np.float32)
+        buy_x, buy_y, sell_x, sell_y = _split_trades(actions, dates, trade_prices)
         
-        if not buy_trades.empty:
+        if buy_x.size > 0:
             ax.scatter(
-                buy_trades['date'], 
-                buy_trades['price'], 
+                buy_x.view('datetime64[ns]'), 
+                buy_y, 
                 color='green', 
                 marker='^', 
                 s=100,
                 label='Buy',
-                alpha=0.8
+                alpha=0.8,
+                rasterized=True
             )
         
-        if not sell_trades.empty:
+        if sell_x.size > 0:
             ax.scatter(
-                sell_trades['date'], 
-                sell_trades['price'], 
+                sell_x.view('datetime64[ns]'), 
+                sell_y, 
                 color='red', 
                 marker='v', 
                 s=100,
                 label='Sell',
-                alpha=0.8
+                alpha=0.8,
+                rasterized=True
             )
     
     # Formatting
@@ -282,11 +705,34 @@ def plot_trades(
     ax.grid(True, alpha=0.3)
     
     # Rotate x-axis labels for better readability
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    fig.autofmt_xdate(rotation=45, ha='right')
     
     return fig
 
+def _correlation_matrix(returns_df: pd.DataFrame) -> pd.DataFrame:
+    """Pearson correlation of the columns, as returns_df.corr() computes it.
+    
+    Complete data is standardized in one contiguous float32 block and
+    correlated with a single matrix product (one BLAS GEMM), instead of
+    pandas' per-pair loop; labels only show two decimals. Rows missing for
+    every asset are dropped first; if other gaps remain, pandas' pairwise
+    handling of missing values is used.
+    """
+    complete = returns_df.dropna(how='all')
+    values = np.ascontiguousarray(complete.to_numpy(dtype=np.float32))
+    if len(values) < 2 or np.isnan(values).any():
+        return returns_df.corr()
+    
+    centered = values - values.mean(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        centered /= np.sqrt((centered * centered).sum(axis=0))
+    corr = np.clip(centered.T @ centered, -1.0, 1.0)
+    
+    # Exact ones on the diagonal (NaN stays NaN for constant columns)
+    diagonal = np.diag_indices_from(corr)
+    corr[diagonal] = np.where(np.isnan(corr[diagonal]), np.nan, 1.0)
+    return pd.DataFrame(corr, index=returns_df.columns, columns=returns_df.columns)
+
 def plot_correlation_heatmap(
     returns_df: pd.DataFrame,
     title: str = "Returns Correlation",
@@ -302,41 +748,65 @@ def plot_correlation_heatmap(
     Returns:
         Matplotlib Figure object
     """
+    import matplotlib.pyplot as plt
+    _ensure_style()
+    
     # Calculate correlation matrix
-    corr = returns_df.corr()
+    corr = _correlation_matrix(returns_df)
     
     # Create mask for upper triangle
     mask = np.triu(np.ones_like(corr, dtype=bool))
     
     # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = plt.subplots(figsize=figsize, layout='constrained')
     
     # Create heatmap
-    sns.heatmap(
-        corr, 
-        mask=mask,
-        annot=True, 
-        fmt=".2f", 
-        cmap='coolwarm', 
-        center=0,
-        square=True,
-        linewidths=0.5,
-        ax=ax
-    )
+    _annotated_heatmap(ax, corr, fmt=".2f", cmap='coolwarm', mask=mask, linewidths=0.5, square=True)
     
     # Formatting
     ax.set_title(title, fontsize=14, fontweight='bold')
-    plt.tight_layout()
     
     return fig
 
+# Summary figures kept for reuse by plot_summary(reuse_figure=True), keyed by
+# figure size; each entry holds the figure and its six axes
+_FIG_POOL: Dict[Tuple, Tuple[plt.Figure, List[plt.Axes]]] = {}
+
+def _make_summary_fig(figsize: Tuple[int, int]) -> Tuple[plt.Figure, List[plt.Axes]]:
+    """Create the summary figure: equity, drawdown, heatmap (+ colorbar), distribution, rolling Sharpe."""
+    import matplotlib.pyplot as plt
+    from matplotlib.gridspec import GridSpec
+    
+    fig = plt.figure(figsize=figsize, layout='constrained')
+    gs = GridSpec(4, 2, height_ratios=[2, 1, 1, 1], figure=fig)
+    heatmap_gs = gs[2, 0].subgridspec(1, 2, width_ratios=[20, 1], wspace=0.05)
+    
+    axes = [
+        fig.add_subplot(gs[0, :]),
+        fig.add_subplot(gs[1, :]),
+        fig.add_subplot(heatmap_gs[0, 0]),
+        fig.add_subplot(heatmap_gs[0, 1]),
+        fig.add_subplot(gs[2, 1]),
+        fig.add_subplot(gs[3, :]),
+    ]
+    return fig, axes
+
+def close_pool() -> None:
+    """Close and forget the figures kept by plot_summary(reuse_figure=True)."""
+    import matplotlib.pyplot as plt
+    
+    for fig, _ in _FIG_POOL.values():
+        plt.close(fig)
+    _FIG_POOL.clear()
+
 def plot_summary(
     equity_curve: pd.Series,
     returns: pd.Series,
     trades: pd.DataFrame,
     benchmark: Optional[pd.Series] = None,
     title: str = "Strategy Performance Summary",
-    figsize: Tuple[int, int] = (12, 16)
+    figsize: Tuple[int, int] = (12, 16),
+    reuse_figure: bool = False
 ) -> plt.Figure:
     """Create a summary dashboard with multiple subplots.
     
@@ -347,69 +817,48 @@ def plot_summary(
         benchmark: Optional benchmark series for comparison
         title: Plot title
         figsize: Figure size (width, height)
+        reuse_figure: Redraw the figure returned by the previous call with the
+                      same figsize instead of creating a new one, for dashboards
+                      regenerated repeatedly (release them with close_pool())
         
     Returns:
         Matplotlib Figure object
     """
-    # Create figure with subplots
-    fig = plt.figure(figsize=figsize)
-    gs = GridSpec(4, 2, height_ratios=[2, 1, 1, 1])
+    _ensure_style()
+    
+    # Create figure with subplots, or clear the pooled one
+    key = tuple(figsize)
+    if reuse_figure and key in _FIG_POOL:
+        fig, axes = _FIG_POOL[key]
+        for ax in axes:
+            ax.cla()
+    else:
+        fig, axes = _make_summary_fig(figsize)
+        if reuse_figure:
+            _FIG_POOL[key] = (fig, axes)
+    ax1, ax2, ax3, cax3, ax4, ax5 = axes
     
     # Plot 1: Equity Curve
-    ax1 = fig.add_subplot(gs[0, :])
-    ax1.plot(equity_curve.index, equity_curve, label='Strategy', linewidth=2)
-    if benchmark is not None:
-        ax1.plot(benchmark.index, benchmark, label='Benchmark', linestyle='--', alpha=0.7)
+    _draw_equity(ax1, equity_curve, benchmark)
     ax1.set_title('Equity Curve', fontsize=12, fontweight='bold')
-    ax1.legend()
-    ax1.grid(True, alpha=0.3)
     
     # Plot 2: Drawdown
-    ax2 = fig.add_subplot(gs[1, :])
-    rolling_max = equity_curve.cummax()
-    drawdown = (equity_curve - rolling_max) / rolling_max * 100
-    ax2.fill_between(drawdown.index, drawdown, 0, color='red', alpha=0.3)
+    _draw_drawdown(ax2, equity_curve)
     ax2.set_title('Drawdown (%)', fontsize=12, fontweight='bold')
-    ax2.grid(True, alpha=0.3)
     
     # Plot 3: Monthly Returns Heatmap
-    ax3 = fig.add_subplot(gs[2, 0])
-    returns_df = returns.to_frame('Returns')
-    returns_df['Year'] = returns_df.index.year
-    returns_df['Month'] = returns_df.index.month_name().str[:3]
-    monthly_returns = returns_df.pivot_table(
-        index='Year', 
-        columns='Month', 
-        values='Returns', 
-        aggfunc=lambda x: (1 + x).prod() - 1
-    ) * 100
-    month_order = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                  'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    monthly_returns = monthly_returns[month_order]
-    sns.heatmap(monthly_returns, annot=True, fmt=".1f", cmap='RdYlGn', center=0, ax=ax3)
+    _draw_monthly_heatmap(ax3, _monthly_returns_matrix(returns), linewidths=0.0, cax=cax3)
     ax3.set_title('Monthly Returns (%)', fontsize=12, fontweight='bold')
     
     # Plot 4: Returns Distribution
-    ax4 = fig.add_subplot(gs[2, 1])
-    sns.histplot(returns * 100, kde=True, bins=30, ax=ax4)
-    mean = returns.mean() * 100
-    median = returns.median() * 100
-    ax4.axvline(mean, color='r', linestyle='--', label=f'Mean: {mean:.2f}%')
-    ax4.axvline(median, color='g', linestyle='-', label=f'Median: {median:.2f}%')
+    _draw_returns_dist(ax4, returns)
     ax4.set_title('Daily Returns Distribution', fontsize=12, fontweight='bold')
-    ax4.legend()
-    ax4.grid(True, alpha=0.3)
     
     # Plot 5: Rolling Sharpe (6-month)
-    ax5 = fig.add_subplot(gs[3, :])
-    rolling_sharpe = returns.rolling(window=126).mean() / returns.rolling(window=126).std() * np.sqrt(252)
-    ax5.plot(rolling_sharpe.index, rolling_sharpe)
-    ax5.axhline(0, color='black', linestyle='-', alpha=0.3)
+    _draw_rolling_sharpe(ax5, returns, 126)
     ax5.set_title('6-Month Rolling Sharpe Ratio', fontsize=12, fontweight='bold')
-    ax5.grid(True, alpha=0.3)
     
-    # Adjust layout
-    plt.suptitle(title, fontsize=16, fontweight='bold', y=0.99)
-    plt.tight_layout(rect=[0, 0, 1, 0.98])
+    # Constrained layout makes room for the title when the figure is drawn
+    fig.suptitle(title, fontsize=16, fontweight='bold')
     
     return fig
@@ -1,15 +1,16 @@
 #!/usr/bin/env python3
 """
 Run the hedge fund simulator example.
-This script is a wrapper to run the example from the project root.
+This script is a wrapper to run the example from the project root; the
+project root is already on sys.path as the script's own directory. When the
+package is installed, the `run-hedgefund-example` command does the same.
 """
-import sys
 import os
 
-# Add the project root to the Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Keep Matplotlib's font cache in a project-local directory so only the first
+# run pays for the system font scan; must be set before matplotlib is imported
+os.environ.setdefault('MPLCONFIGDIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mplcache'))
 
-# Now import and run the example
 from hedgefund_simulator.example import main
 
 if __name__ == "__main__":